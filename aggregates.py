@@ -0,0 +1,117 @@
+"""Lapisan agregasi bersama untuk dashboard.
+
+Setiap ringkasan (groupby) dihitung satu kali per status filter lalu disimpan
+di cache LRU tingkat proses, sehingga rerun Streamlit dan sesi lain dengan
+filter yang sama cukup mengambil hasil yang sudah ada.
+"""
+import threading
+from collections import OrderedDict
+
+from profiling import timed
+
+
+
+class AggregateCache:
+    """Cache LRU berukuran tetap untuk hasil agregasi.
+
+    Hasil yang dikembalikan dipakai bersama oleh semua sesi, jadi pemanggil
+    tidak boleh mengubahnya (gunakan ``.copy()`` bila perlu).
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        # Hitung di luar lock agar sesi lain tidak ikut tertahan
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+def all_data_key(version):
+    # Kunci untuk agregasi atas seluruh data (tanpa filter) pada versi data tertentu
+    return (version, "__semua__")
+
+
+def filter_key(search, univ, jenjang, provinsi, range_peminat, range_daya, range_rasio, version=None,
+               search_fields=None, clusters=None):
+    # Status filter sidebar (plus versi data sumber) dalam bentuk tuple yang bisa di-hash
+    return (
+        version,
+        (search or "").strip().lower(),
+        tuple(search_fields or ()),
+        univ,
+        jenjang,
+        provinsi,
+        tuple(range_peminat),
+        tuple(range_daya),
+        tuple(range_rasio),
+        tuple(clusters or ()),
+    )
+
+
+# ======================= DEFINISI AGREGASI ========================
+def _plain_index(result):
+    # Indeks kategori diubah ke string agar seaborn tidak ikut menggambar kategori kosong
+    result.index = result.index.astype(str)
+    return result
+
+
+def _nama_sums(df):
+    # Dipakai bersama oleh grafik 1, 2, dan 4 (top 8 / bottom 8)
+    return _plain_index(df.groupby('nama', observed=True)[['peminat', 'daya_tampung_2025']].sum())
+
+
+def _univ_rasio_mean(df):
+    # Dipakai bersama oleh grafik 9 dan 11
+    return _plain_index(df.groupby('asal_univ', observed=True)['rasio_keketatan'].mean().sort_values(ascending=False))
+
+
+def _provinsi_peminat(df):
+    # Dipakai oleh heatmap provinsi (grafik 6)
+    return _plain_index(df.groupby('provinsi', observed=True)['peminat'].sum())
+
+
+AGGREGATES = {
+    "nama_sums": _nama_sums,
+    "univ_rasio_mean": _univ_rasio_mean,
+    "provinsi_peminat": _provinsi_peminat,
+}
+
+_cache = AggregateCache()
+
+
+def get_aggregate(name, df, key, cache=None):
+    cache = _cache if cache is None else cache
+    compute = AGGREGATES[name]
+    with timed("pandas"):
+        return cache.get_or_compute((name, key), lambda: compute(df))
+
+
+def put_aggregate(name, key, compute, cache=None):
+    # Isi cache dengan agregat yang dihitung di tempat lain (mis. store inkremental);
+    # ``compute`` hanya dipanggil bila kunci ini belum ada di cache
+    cache = _cache if cache is None else cache
+    cache.get_or_compute((name, key), compute)
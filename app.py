@@ -1,31 +1,129 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
+
+from aggregates import all_data_key, filter_key, get_aggregate, put_aggregate
+from assets import thumbnail_url
+from charts import render_plotly, render_png
+from classifier import FEATURES, TARGETS, submit_training
+from clustering import CLUSTER_COLUMNS, submit_clustering
+from data_loader import (DATA_PATH, load_dataset, load_snapshot, read_only_frame, snapshot_stem, snapshot_target,
+                         source_hash)
+from export import FORMATS, discard, expired, submit
+from filter_index import FilterIndex
+from ingest import STORE_DIR, Store
+from profiling import Profiler, activate, is_enabled, timed
+from recommend import DEFAULT_WEIGHTS, RecommendationEngine
+import sections
+from search_index import EXTENDED_FIELDS, SEARCH_FIELDS, SearchIndex
 
 # ======================= CONFIG & LOAD ========================
 st.set_page_config(page_title="Dashboard Analisis Jurusan", layout="wide")
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv('Data/Data Jurusan Peminat Saintex.csv')
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-    df.rename(columns={
-        "nama_ptn": "asal_univ",
-        "jurusan": "nama",
-        "daya_tampung_(tahun_2025)": "daya_tampung_2025",
-        "jumlah_peminat": "peminat"
-    }, inplace=True)
-    return df
-df = load_data()
+# Profiling per bagian, aktif lewat DASHBOARD_PROFILE=1 atau parameter URL ?profile=1
+profiler = activate(Profiler(is_enabled(st.query_params)))
+profiler.start_section("Load Data")
+
+# Dataset dimuat sekali per proses dan dipakai bersama semua sesi tanpa salinan per pemanggil
+# (cache_resource, bukan cache_data). Kolom numeriknya view read-only atas snapshot Arrow
+# yang di-memory-map; hash CSV ikut menjadi kunci, jadi data dimuat ulang saat file sumber berubah
+@st.cache_resource
+def load_data(data_version):
+    return load_dataset(DATA_PATH)
+
+# Data multi-tahun dari store (lihat ingest.py): hanya partisi tahun terpilih yang dibaca,
+# lalu disimpan sebagai snapshot Arrow per versi store agar juga dibagi read-only lewat memory map.
+# Nama kolom daya_tampung_2025 dipertahankan agar seluruh dashboard tetap bisa dipakai;
+# isinya adalah daya tampung tahun yang dipilih.
+@st.cache_resource
+def load_store_data(data_version, tahun):
+    return load_snapshot(
+        snapshot_target(f"store_{tahun}", data_version),
+        lambda: Store(STORE_DIR).load(tahun).rename(columns={"daya_tampung": "daya_tampung_2025"}),
+    )
+
+store = Store(STORE_DIR)
+if store.exists():
+    selected_tahun = st.sidebar.selectbox("Tahun Data", store.years()[::-1])
+    data_version = f"{store.version}-{selected_tahun}"
+    data_name = f"store_{selected_tahun}"
+    df = load_store_data(data_version, selected_tahun)
+    # Rata-rata rasio per PTN dan peminat per provinsi sudah dihitung inkremental saat ingest;
+    # dibaca dari store hanya bila belum ada di cache untuk versi data ini
+    put_aggregate("univ_rasio_mean", all_data_key(data_version), lambda: store.university_rasio_mean(selected_tahun))
+    put_aggregate("provinsi_peminat", all_data_key(data_version), lambda: store.province_peminat(selected_tahun))
+else:
+    data_version = source_hash(DATA_PATH)
+    data_name = snapshot_stem(DATA_PATH)
+    df = load_data(data_version)
+
+# Indeks filter dibangun sekali per versi data dan dipakai bersama semua sesi
+@st.cache_resource
+def load_filter_index(data_version, _df):
+    return FilterIndex(_df)
+filter_index = load_filter_index(data_version, df)
+
+# Indeks pencarian (token + trigram) atas nilai unik, juga dibangun sekali per versi data
+@st.cache_resource
+def load_search_index(data_version, _df):
+    return SearchIndex(_df)
+search_index = load_search_index(data_version, df)
+
+# Matriks kriteria rekomendasi juga dibangun sekali per versi data
+@st.cache_resource
+def load_recommender(data_version, _df):
+    return RecommendationEngine(_df)
+recommender = load_recommender(data_version, df)
+
+# Model klasifikasi dimuat (atau dilatih bila belum ada) sekali per proses di thread
+# latar belakang, sehingga tidak ada rerun pengguna yang menunggu pelatihan
+@st.cache_resource
+def load_classifier(data_version, _df):
+    return submit_training(_df)
+model_future = load_classifier(data_version, df) if all(col in df.columns for col in FEATURES + TARGETS) else None
+
+# Prediksi seluruh dataset sama untuk semua sesi: dihitung sekali per versi data dan model
+# dalam satu pemanggilan, lalu dibagi sebagai DataFrame read-only
+@st.cache_resource
+def load_predictions(data_version, model_hash, _model, _df):
+    with timed("pandas"):
+        return read_only_frame(_model.predict(_df))
+
+# Klaster jurusan & universitas juga dihitung di latar belakang (lihat clustering.py)
+@st.cache_resource
+def load_clusters(data_version, _df):
+    return submit_clustering(_df, data_name, data_version)
+cluster_future = load_clusters(data_version, df)
+
+# Bitmap klaster ditambahkan ke indeks filter sekali per versi data
+@st.cache_resource
+def index_clusters(data_version, _filter_index, _clusters):
+    for col in CLUSTER_COLUMNS:
+        _filter_index.add_categorical(col, _clusters[col])
+    return _clusters
+
+# Masukan grafik atas seluruh data (tanpa filter) hanya bergantung pada versi data, jadi
+# urutan/salinan DataFrame-nya disiapkan sekali per proses, bukan di setiap rerun
+@st.cache_resource
+def chart_input(name, data_version, _df):
+    with timed("pandas"):
+        return sections.FULL_DATA_INPUTS[name](_df)
 
 # ======================= SIDEBAR ========================
+profiler.start_section("Sidebar & Filter")
 st.sidebar.title("🔍 Sistem Pencarian")
 st.sidebar.markdown("Gunakan filter berikut untuk eksplorasi data:")
 
 # Text input untuk mencari jurusan
 search_jurusan = st.sidebar.text_input("Cari Jurusan:")
+search_extended = st.sidebar.checkbox("Cari juga di nama PTN & prospek kerja")
+search_fields = EXTENDED_FIELDS if search_extended else SEARCH_FIELDS
+if search_jurusan:
+    # Tampilkan hasil teratas (mendukung awalan dan salah ketik)
+    search_suggestions = search_index.search(search_jurusan, search_fields, limit=5)
+    if search_suggestions:
+        st.sidebar.caption("Hasil teratas: " + ", ".join(value for _, value, _ in search_suggestions))
+    else:
+        st.sidebar.caption("Tidak ada jurusan yang cocok.")
 
 # Select box untuk memilih universitas
 selected_univ = st.sidebar.selectbox("Pilih Universitas", ['Semua'] + sorted(df['asal_univ'].unique()))
@@ -39,6 +137,16 @@ if 'provinsi' in df.columns:
 else:
     selected_provinsi = 'Semua'
 
+# Select box klaster, tersedia setelah klaster selesai dihitung
+selected_clusters = {}
+if cluster_future.done() and cluster_future.exception() is None:
+    clusters = index_clusters(data_version, filter_index, cluster_future.result())
+    for col, label in zip(CLUSTER_COLUMNS, ["Pilih Klaster Jurusan", "Pilih Klaster Universitas"]):
+        selected_clusters[col] = st.sidebar.selectbox(label, ['Semua'] + list(clusters[col].cat.categories))
+    st.sidebar.caption("Klaster diurutkan dari rata-rata peminat terendah (Klaster 1) ke tertinggi.")
+elif not cluster_future.done():
+    st.sidebar.caption("⏳ Klaster jurusan sedang dihitung...")
+
 # Slider untuk jumlah peminat
 min_peminat, max_peminat = int(df['peminat'].min()), int(df['peminat'].max())
 range_peminat = st.sidebar.slider("Jumlah Peminat", min_peminat, max_peminat, (min_peminat, max_peminat))
@@ -52,40 +160,57 @@ min_rasio, max_rasio = float(df['rasio_keketatan'].min()), float(df['rasio_keket
 range_rasio = st.sidebar.slider("Rasio Keketatan", float(min_rasio), float(max_rasio), (float(min_rasio), float(max_rasio)))
 
 # --- Filter Data ---
-filtered_df = df.copy()
+# Setiap filter menjadi bitmap, lalu digabung dengan satu AND menjadi posisi baris
+filter_bitmaps = [
+    filter_index.between('peminat', *range_peminat),
+    filter_index.between('daya_tampung_2025', *range_daya),
+    filter_index.between('rasio_keketatan', *range_rasio),
+]
 
 if search_jurusan:
-    filtered_df = filtered_df[filtered_df['nama'].str.contains(search_jurusan, case=False, na=False)]
+    filter_bitmaps.append(filter_index.from_mask(search_index.mask(search_jurusan, search_fields)))
 
 if selected_univ != 'Semua':
-    filtered_df = filtered_df[filtered_df['asal_univ'] == selected_univ]
+    filter_bitmaps.append(filter_index.equals('asal_univ', selected_univ))
 
 if selected_jenjang != 'Semua':
-    filtered_df = filtered_df[filtered_df['jenjang'] == selected_jenjang]
+    filter_bitmaps.append(filter_index.equals('jenjang', selected_jenjang))
 
 if selected_provinsi != 'Semua':
-    filtered_df = filtered_df[filtered_df['provinsi'] == selected_provinsi]
+    filter_bitmaps.append(filter_index.equals('provinsi', selected_provinsi))
 
-filtered_df = filtered_df[
-    (filtered_df['peminat'] >= range_peminat[0]) & (filtered_df['peminat'] <= range_peminat[1]) &
-    (filtered_df['daya_tampung_2025'] >= range_daya[0]) & (filtered_df['daya_tampung_2025'] <= range_daya[1]) &
-    (filtered_df['rasio_keketatan'] >= range_rasio[0]) & (filtered_df['rasio_keketatan'] <= range_rasio[1])
-]
+for col, selected_cluster in selected_clusters.items():
+    if selected_cluster != 'Semua':
+        filter_bitmaps.append(filter_index.equals(col, selected_cluster))
+
+with timed("pandas"):
+    selected_rows = filter_index.select(filter_bitmaps)
+    filtered_df = df.iloc[selected_rows]
+# Kunci cache agregasi untuk kombinasi filter saat ini
+filter_state = filter_key(search_jurusan, selected_univ, selected_jenjang, selected_provinsi,
+                          range_peminat, range_daya, range_rasio, version=data_version,
+                          search_fields=search_fields, clusters=tuple(selected_clusters.items()))
 
 # ======================= PROFIL KELOMPOK ========================
+profiler.start_section("Profil Kelompok")
 st.markdown("## 👥 Kelompok Analisis Data Jurusan")
+# Thumbnail WebP kecil dilayani dari folder static, bukan foto asli berukuran MB
+def show_profile(path, caption):
+    st.markdown(f'<img src="{thumbnail_url(path)}" width="130" alt="{caption}">', unsafe_allow_html=True)
+    st.caption(caption)
+
 colA, colB, colC, colD = st.columns(4)
 with colA:
-    st.image("images/eka.jpg", width=130, caption="Ni Putu Eka Martini - 568")
+    show_profile("images/eka.jpg", "Ni Putu Eka Martini - 568")
     st.markdown("`Data Sains`")
 with colB:
-    st.image("images/go.jpg", width=130, caption="Pande Komang Bhargo Anantha Yogiswara - 569")
+    show_profile("images/go.jpg", "Pande Komang Bhargo Anantha Yogiswara - 569")
     st.markdown("`Data Sains`")
 with colC:
-    st.image("images/ardi.jpg", width=130, caption="Putu Ardi Sudarmika - 570")
+    show_profile("images/ardi.JPG", "Putu Ardi Sudarmika - 570")
     st.markdown("`Data Sains`")
 with colD:
-    st.image("images/oni.jpg", width=130, caption="Putu Chandra Mayoni - 571")
+    show_profile("images/oni.jpg", "Putu Chandra Mayoni - 571")
     st.markdown("`Data Sains`")
 st.success("**Nama Kelompok: Mini Time 5C**-Jurusan MIPA di Perguruan Tinggi yang sepi peminat namun mempunyai prospek kerja yang bagus ")
 
@@ -100,6 +225,7 @@ Dashboard ini dirancang untuk membantu:
 """)
 
 # ======================= STATISTICS ========================
+profiler.start_section("Ringkasan Data")
 st.markdown("## 📌 Ringkasan Data")
 col1, col2, col3 = st.columns(3)
 col1.metric("Jumlah Jurusan Unik", filtered_df['nama'].nunique())
@@ -108,266 +234,204 @@ col3.metric("Total Daya Tampung", filtered_df['daya_tampung_2025'].sum())
 
 # ======================= VISUALISASI ========================
 st.markdown("## 📈 Visualisasi Data")
-# Top 10 Jurusan Peminat Terbanyak
-st.markdown("### 1. 🔝 Top 10 Jurusan dengan Peminat Terendah")
-top_jurusan = filtered_df.groupby('nama')['peminat'].sum().sort_values(ascending=True).head(10)
-fig1, ax1 = plt.subplots(figsize=(12, 5))
-sns.barplot(x=top_jurusan.values, y=top_jurusan.index, palette='viridis', ax=ax1)
-ax1.set_title("Top 10 Jurusan Berdasarkan Peminat")
-ax1.set_xlabel("Jumlah Peminat")
-ax1.set_ylabel("Jurusan")
-st.pyplot(fig1)
-st.markdown("###### Keterangan: Grafik “Jurusan dengan Peminat Terendah” menampilkan sepuluh program studi dengan jumlah peminat paling sedikit, sebagian hanya 1-3 orang. Jurusan seperti Agrowisata Bahari, Budidaya Ternak, Tanaman Pangan, Pengelola Hutan, dan Ilmu Perpustakaan termasuk dalam daftar ini, kebanyakan terkait pertanian, kehutanan, perikanan, dan konservasi lingkungan.")
-
-
-# Daya Tampung
-st.markdown("### 2. 📚 Top 10 Jurusan dengan Daya Tampung Tertinggi")
-top_daya = filtered_df.groupby('nama')['daya_tampung_2025'].sum().sort_values(ascending=False).head(10)
-fig2, ax2 = plt.subplots(figsize=(12, 5))
-sns.barplot(x=top_daya.values, y=top_daya.index, palette='magma', ax=ax2)
-ax2.set_title("Top 10 Jurusan Berdasarkan Daya Tampung 2025")
-st.pyplot(fig2)
-st.markdown("###### Keterangan: Visualisasi sepuluh jurusan saintek dengan daya tampung terbanyak di PTN Indonesia menunjukkan bahwa jurusan sains murni seperti Fisika, Biologi, Matematika, dan Kimia tetap memiliki daya tampung besar meskipun peminatnya sedikit. Teknik Elektro, Budidaya Perairan, dan Ilmu Kelautan tampil di dua grafik, tetapi daya tampungnya lebih kecil dari jumlah peminat, menandakan seleksi yang ketat. Pendidikan Kimia dan Teknik Mesin juga memiliki daya tampung tinggi tetapi tidak masuk daftar terfavorit, menunjukkan persaingan yang lebih longgar. ")
-
-
-# Pie Chart Jenjang
-st.markdown("### 3. 🏫 Distribusi Jenjang Pendidikan")
-jenjang_count = filtered_df['jenjang'].value_counts()
-fig3, ax3 = plt.subplots()
-ax3.pie(jenjang_count, labels=jenjang_count.index, autopct='%1.1f%%', startangle=140)
-ax3.set_title("Distribusi Jenjang Pendidikan")
-st.pyplot(fig3)
-st.markdown("###### Keterangan: Visualisasi menunjukkan distribusi jenjang pendidikan berdasarkan data. Berdasarkan visualisasi tersebut, Mayoritas program studi berada pada jenjang S1 (86,7%), sedangkan jenjang D3 dan D4 masing-masing hanya mencakup 8,9% dan 4,4%. Ini menunjukkan fokus utama institusi adalah pada pendidikan sarjana (S1). ")
-
-
-st.markdown("### 4. Perbandingan Peminat dengan Daya Tampung")
-# Hitung Top 8 dan Bottom 8 berdasarkan jumlah peminat
-top_8 = filtered_df.groupby('nama')[['peminat', 'daya_tampung_2025']].sum().sort_values(by='peminat', ascending=False).head(8)
-bottom_8 = filtered_df.groupby('nama')[['peminat', 'daya_tampung_2025']].sum().sort_values(by='peminat', ascending=True).head(8)
-# Fungsi untuk menampilkan bar chart di Streamlit
-def plot_dual_bar(data, title):
-    fig, ax = plt.subplots(figsize=(12,6))
-    data.plot(kind='bar', ax=ax)
-    ax.set_title(title)
-    ax.set_xlabel("Jurusan")
-    ax.set_ylabel("Jumlah")
-    ax.set_xticklabels(data.index, rotation=45, ha='right')
-    ax.legend(["Peminat", "Daya Tampung"])
-    ax.grid(True)
-    st.pyplot(fig)
-# Tampilkan grafik untuk top 8
-plot_dual_bar(top_8, "Top 8 Jurusan: Peminat vs Daya Tampung")
-# Tampilkan grafik untuk bottom 8
-plot_dual_bar(bottom_8, "Bottom 8 Jurusan: Peminat vs Daya Tampung")
-
-st.markdown("###### Keterangan: Visualisasi menunjukkan semua jurusan memiliki peminat melebihi kapasitas, dengan jurusan seperti Fisika, Biologi, dan Matematika menunjukkan persaingan sangat ketat. Bahkan jurusan dengan peminat lebih sedikit, seperti Budidaya Perairan dan Ilmu Kelautan, tetap menunjukkan kompetisi tinggi akibat daya tampung terbatas, menandakan tingginya minat yang belum sejalan dengan kapasitas tersedia. Visualisasi menunjukkan bahwa banyak jurusan, seperti Budidaya Ternak, Tanaman Pangan, dan Tanaman Perkebunan, memiliki daya tampung sekitar 56 orang tetapi diminati hanya 1-3 orang, menunjukkan kurangnya minat calon mahasiswa. Demikian pula, jurusan seperti Agrowisata Bahari, Pengelola Hutan, dan Teknologi Budidaya Perikanan menunjukkan ketimpangan serupa, dengan kapasitas besar tetapi minim peminat. ")
-
-
-st.markdown("### 5. Top 10 Jurusan dengan Rata-rata Gaji Tertinggi")
-# Cek apakah kolom gaji tersedia
-if 'rata-rata_gaji_lulusan' in df.columns:
-    # Bersihkan nilai agar numerik
-    filtered_df['gaji_bersih'] = filtered_df['rata-rata_gaji_lulusan'].replace('[^0-9]', '', regex=True).astype(float)
-    # Ambil data dengan gaji tertinggi per jurusan
-    data_filtered = filtered_df.loc[filtered_df.groupby('nama')['gaji_bersih'].idxmax()]
-    # Top 10 jurusan dengan gaji tertinggi
-    top_gaji_langsung = data_filtered[['nama', 'gaji_bersih']].sort_values(by='gaji_bersih', ascending=False).head(10)
-    # Tampilkan tabel
-    st.dataframe(top_gaji_langsung.rename(columns={"nama": "Jurusan", "gaji_bersih": "Gaji (Rp)"}))
-    # Visualisasi bar chart horizontal
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x='gaji_bersih', y='nama', data=top_gaji_langsung, palette='viridis', ax=ax)
-    ax.set_title("Top 10 Jurusan dengan Gaji Tertinggi")
-    ax.set_xlabel("Gaji (Rp)")
-    ax.set_ylabel("Nama Jurusan")
-    st.pyplot(fig)
-else:
-    st.warning("Kolom 'rata-rata_gaji_lulusan' tidak ditemukan dalam dataset. Harap periksa kembali nama kolom.")
-    
-st.markdown("### 💰 Jurusan dengan Rata-Rata Gaji Lulusan Tertinggi")
-top_gaji = filtered_df.sort_values(by="rata-rata_gaji_lulusan", ascending=True).head(10)
-fig, ax = plt.subplots(figsize=(12, 6))
-sns.barplot(data=top_gaji, x="rata-rata_gaji_lulusan", y="nama", palette="crest", ax=ax)
-ax.set_xlabel("Gaji (Rata-Rata)")
-ax.set_ylabel("Jurusan")
-st.pyplot(fig)  
-
-st.markdown("### 📦 Distribusi Gaji Lulusan Berdasarkan Jenjang")
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.boxplot(data=filtered_df, x="jenjang", y="rata-rata_gaji_lulusan", palette="pastel", ax=ax)
-ax.set_xlabel("Jenjang")
-ax.set_ylabel("Gaji Lulusan")
-st.pyplot(fig)
-st.markdown("###### Keterangan: Visualisasi ini menunjukkan 10 jurusan dengan gaji bersih tertinggi, tanpa memperhitungkan rata-rata. Kehutanan berada di puncak dengan Rp14 juta, diikuti Kimia Rp12,5 juta, dan Ilmu Tanah muncul dua kali dengan Rp12 juta, menunjukkan variasi gaji dalam jurusan yang sama. Jurusan lain seperti Ilmu Kelautan, Teknik Elektro, dan Teknik Listrik juga menawarkan gaji tinggi. Bahkan jurusan yang kurang diminati seperti Budidaya Peternakan, Akuakultur, dan Proteksi Tanaman tetap memberikan gaji kompetitif sekitar Rp9-9,5 juta, menandakan prospek kerja yang menjanjikan meskipun minatnya rendah. ")
-
-
-# Heatmap Provinsi
-if 'provinsi' in df.columns:
-    st.markdown("### 6. 🗺️ Heatmap Peminat per Provinsi")
-    provinsi_data = filtered_df.groupby('provinsi')['peminat'].sum().reset_index()
-    heatmap_data = provinsi_data.set_index('provinsi').T
-    fig5, ax5 = plt.subplots(figsize=(12, 2))
-    sns.heatmap(heatmap_data, annot=True, cmap='YlGnBu', fmt=",.0f", cbar_kws={'label': 'Peminat'})
-    ax5.set_title('Jumlah Peminat per Provinsi')
-    st.pyplot(fig5)
-st.markdown("###### Keterangan: Heatmap jumlah peminat berdasarkan provinsi di Indonesia menunjukkan bahwa Lampung memiliki peminat terbanyak, dengan warna paling gelap. Aceh, Jawa Tengah, dan Jawa Timur juga menunjukkan tingkat peminat tinggi, sedangkan Banten, Maluku, dan Sulawesi Barat menunjukkan jumlah peminat yang lebih rendah, terlihat dari warna yang lebih terang. ")
-
-
-# Scatter Plot Keketan vs Gaji
-# st.markdown("### 7. 💵 Gaji vs Keketatan")
-# scatter_df = filtered_df[['rasio_keketatan', 'rata-rata_gaji_lulusan', 'nama']].dropna()
-# scatter_df['rasio_keketatan'] = pd.to_numeric(scatter_df['rasio_keketatan'], errors='coerce')
-# scatter_df['rata-rata_gaji_lulusan'] = pd.to_numeric(scatter_df['rata-rata_gaji_lulusan'], errors='coerce')
-# scatter_df = scatter_df.dropna()
-# fig4 = px.scatter(
-#     scatter_df,
-#     x='rasio_keketatan',
-#     y='rata-rata_gaji_lulusan',
-#     color='nama',
-#     hover_name='nama',
-#     title='Rasio Keketatan vs Rata-rata Gaji Lulusan',
-#     labels={
-#         "rasio_keketatan": "Rasio Keketatan",
-#         "rata-rata_gaji_lulusan": "Gaji Lulusan (Rp)"
-#     }
-# )
-# st.plotly_chart(fig4)
-# st.markdown("##### Keterangan: ")
-
-
-st.markdown("### 8. Top 20 Jurusan dengan Rasio Keketatan Tertinggi")
-# Contoh data (Ganti dengan df = pd.read_csv() atau df asli Anda)
-# df = pd.read_csv('path_dataset.csv')
-# Pastikan kolom yang dibutuhkan ada
-if 'rasio_keketatan' in df.columns and 'nama' in df.columns:
-    # Urutkan data berdasarkan rasio keketatan tertinggi
-    top_rasio = df.sort_values(by="rasio_keketatan", ascending=False).head(20)
-    # Plot barplot horizontal
-    fig, ax = plt.subplots(figsize=(12, 8))
-    sns.barplot(data=top_rasio, x="rasio_keketatan", y="nama", palette="viridis", ax=ax)
-    ax.set_title("Top 20 Jurusan dengan Rasio Keketatan Tertinggi", fontsize=14)
-    ax.set_xlabel("Rasio Keketatan (Peminat / Daya Tampung)", fontsize=12)
-    ax.set_ylabel("Nama Jurusan", fontsize=12)
-    st.pyplot(fig)
-else:
-    st.warning("Kolom 'rasio_keketatan' atau 'nama' tidak ditemukan dalam dataset. Harap pastikan nama kolom sesuai.")
-st.markdown("###### Keterangan: Visualisasi ini menampilkan 20 jurusan dengan rasio keketatan tertinggi, dimana Fisika berada di posisi pertama, menandakan persaingan sangat ketat karena peminat jauh melebihi daya tampung. Jurusan lain seperti Budidaya Ternak, Tanaman Pangan, Pendidikan Fisika, Teknik Listrik, Agrowisata Bahari, dan Teknologi Perikanan juga menunjukkan tingkat persaingan tinggi. Umumnya, jurusan terkait pertanian, peternakan, dan perikanan mendominasi daftar ini, menggambarkan tingginya minat di bidang tersebut dibanding kapasitas yang tersedia.")
-
-st.markdown("### 9. Rata-rata Rasio Keketatan per Universitas (Top 15)")
-# Pastikan kolom yang dibutuhkan tersedia
-if 'asal_univ' in df.columns and 'rasio_keketatan' in df.columns:
-    # Hitung rata-rata rasio keketatan per universitas
-    avg_rasio_univ = df.groupby("asal_univ")["rasio_keketatan"].mean().sort_values(ascending=False).head(15)
-    # Visualisasi
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.barplot(x=avg_rasio_univ.values, y=avg_rasio_univ.index, palette="mako", ax=ax)
-    ax.set_title("Rata-rata Rasio Keketatan per Universitas (Top 15)", fontsize=14)
-    ax.set_xlabel("Rata-rata Rasio Keketatan", fontsize=12)
-    ax.set_ylabel("Asal Universitas", fontsize=12)
-    st.pyplot(fig)
-else:
-    st.warning("Kolom 'asal_univ' atau 'rasio_keketatan' tidak ditemukan dalam dataset.")
-st.markdown("###### Keterangan: Visualisasi ini memperlihatkan 15 universitas dengan rata-rata rasio keketatan tertinggi, yang menandakan persaingan masuk yang sangat ketat di program studi masing-masing. Universitas Papua berada di posisi teratas, menunjukkan bahwa daya tampung sangat terbatas dibandingkan minat calon mahasiswa. Diikuti oleh Politeknik Perikanan Negeri Tual, Universitas Pattimura, dan Politeknik Negeri FakFak. Mayoritas universitas dalam daftar ini berasal dari wilayah Indonesia Timur, seperti Papua, Maluku, dan Nusa Tenggara, mencerminkan tingginya minat terhadap pendidikan tinggi di daerah tersebut meskipun kapasitasnya kecil.")
-
-
-# Bubble Chart
-st.markdown("### 10. 🧼 Bubble Chart: Peminat vs Daya Tampung")
-# Cek apakah semua kolom tersedia
-required_columns = ["peminat", "daya_tampung_2025", "rasio_keketatan", "jenjang"]
-if all(col in df.columns for col in required_columns):
-    # Konversi kategori jenjang ke kode numerik
-    df["jenjang_kode"] = df["jenjang"].astype('category').cat.codes
-    # Buat bubble chart
-    fig, ax = plt.subplots(figsize=(10, 6))
-    scatter = ax.scatter(
-        df["peminat"],
-        df["daya_tampung_2025"],
-        s=df["rasio_keketatan"] * 100,
-        c=df["jenjang_kode"],
-        alpha=0.6,
-        cmap='Set3'
-    )
-    ax.set_xlabel("Jumlah Peminat")
-    ax.set_ylabel("Daya Tampung")
-    ax.set_title("Bubble Chart Rasio Keketatan per Jurusan")
-    plt.colorbar(scatter, label="Jenjang (kode numerik)")
-    ax.grid(True)
-    plt.tight_layout()
-    # Tampilkan plot di Streamlit
-    st.pyplot(fig)
-else:
-    st.warning("Beberapa kolom yang dibutuhkan ('peminat', 'daya_tampung_2025', 'rasio_keketatan', 'jenjang') tidak ditemukan.")
-st.markdown("###### Keterangan: Visualisasi ini menunjukkan bahwa jurusan dengan rasio keketatan tinggi umumnya memiliki daya tampung kecil dan tetap diminati, sehingga persaingan menjadi sangat ketat. Meskipun jurusan S1 lebih banyak, beberapa jurusan D3 dan D4 juga menunjukkan tingkat keketatan yang tinggi. Hal ini menegaskan bahwa tingkat keketatan dipengaruhi tidak hanya oleh jumlah peminat, tetapi juga oleh kapasitas daya tampung masing-masing jurusan. ")
-
-
-st.markdown("### 11. Lollipop Chart: Rata-rata Rasio Keketatan per Universitas (Top 15)")
-# Cek apakah kolom yang dibutuhkan tersedia
-if "asal_univ" in df.columns and "rasio_keketatan" in df.columns:
-    # Hitung rata-rata rasio keketatan per universitas
-    avg_rasio_univ = df.groupby("asal_univ")["rasio_keketatan"].mean().sort_values(ascending=False).head(15)
-    # Lollipop Chart
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.hlines(y=avg_rasio_univ.index, xmin=0, xmax=avg_rasio_univ.values, color='skyblue')
-    ax.plot(avg_rasio_univ.values, avg_rasio_univ.index, "o", color='blue')
-    ax.set_title("Rata-rata Rasio Keketatan per Universitas (Top 15)", fontsize=14)
-    ax.set_xlabel("Rata-rata Rasio Keketatan", fontsize=12)
-    ax.set_ylabel("Asal Universitas", fontsize=12)
-    ax.grid(axis='x', linestyle='--', alpha=0.5)
-    plt.tight_layout()
-    # Tampilkan chart di Streamlit
-    st.pyplot(fig)
-else:
-    st.warning("Kolom 'asal_univ' atau 'rasio_keketatan' tidak ditemukan dalam DataFrame.")
-st.markdown("###### Keterangan: Visualisasi ini menampilkan 15 universitas dengan rasio keketatan tertinggi. Universitas Papua berada di posisi teratas dengan rasio sekitar 16, menunjukkan tingkat persaingan sangat tinggi. Politeknik Perikanan Negeri Tual dan Universitas Pattimura juga punya rasio tinggi, mendekati 11 dan 6. Sebaliknya, universitas seperti Tadulako, Timor, dan Malikussaleh memiliki rasio di bawah 2, menandakan selektivitas lebih rendah. Grafik ini menunjukkan variasi besar dalam tingkat persaingan masuk, terutama di kawasan timur dan tengah Indonesia.")
-
-
-st.markdown("### 12. Jumlah Peminat Per Universitas dan Jurusan")
-# Pastikan kolom yang dibutuhkan tersedia
-required_columns = ['asal_univ', 'nama', 'peminat', 'jenjang']
-if all(col in df.columns for col in required_columns):
-    # Buat Treemap
-    fig = px.treemap(
-        df,
-        path=['asal_univ', 'nama'],
-        values='peminat',
-        color='jenjang',
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
-    # Tampilkan di Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-else:
-    st.warning("Beberapa kolom yang dibutuhkan tidak ditemukan dalam DataFrame.")
-st.markdown("###### Keterangan: Visualisasi ini menampilkan distribusi program studi sains di berbagai universitas Indonesia, dengan ukuran kotak menunjukkan jumlah program atau mahasiswa. Universitas Gadjah Mada, Diponegoro, dan Lampung memiliki keragaman terbesar, sementara jurusan Biologi, Fisika, dan Kimia paling umum. Beberapa universitas seperti Riau, Sriwijaya, dan Institut Teknologi Sumatera lebih fokus pada program tertentu. Warna-warna berbeda memudahkan identifikasi institusi, memberikan gambaran soal sebaran dan fokus program studi sains di tanah air. ")
-
-
-st.markdown("### 13. Visualisasi Hirarki Universitas, Jenjang, dan Jurusan di Bali")
-# Filter data for Bali province
-df_bali = df[df['provinsi'].str.lower() == 'bali']
-# Create the Sunburst chart
-fig = px.sunburst(
-    df_bali,
-    path=['asal_univ', 'jenjang', 'nama'],  # Hierarchy: University > Level > Major
-    values='peminat',
-    color_discrete_sequence=px.colors.qualitative.Set2
-)
-# Update layout for better presentation
-fig.update_layout(margin=dict(t=50, l=0, r=0, b=0))
-# Display the plot
-st.plotly_chart(fig)
-st.markdown("###### Keterangan: Diagram sunburst ini menunjukkan program studi dengan jumlah peminat rendah di Universitas Udayana dan Universitas Ganesha. Di Udayana, seluruh program sepi peminat berada di jenjang S1 dan berasal dari rumpun sains dan teknologi, seperti Ilmu Kelautan dan Fisika. Di Ganesha, program sepi peminat tersebar di jenjang S1 dan D4, terutama bidang kependidikan seperti Pendidikan IPA dan Pendidikan Fisika, serta beberapa program non-kependidikan. Secara umum, program studi dari bidang sains dan kependidikan cenderung kurang diminati di kedua universitas, menjadi bahan evaluasi untuk meningkatkan daya tarik melalui inovasi kurikulum, prospek kerja, dan promosi. ")
-
-
-# Visualisasi Tambahan
-
-st.markdown("### 14. 📈 Histogram Distribusi Peminat")
-fig, ax = plt.subplots(figsize=(8, 5))
-sns.histplot(df['peminat'], bins=30, kde=True, color='skyblue', ax=ax)
-ax.set_xlabel("Jumlah Peminat")
-ax.set_ylabel("Frekuensi")
-st.pyplot(fig)
-# st.markdown("##### Keterangan: ")
+# Hanya kelompok grafik yang dipilih yang dihitung dan dirender pada rerun ini
+SECTION_GROUPS = ["Peminat & Daya Tampung", "Gaji Lulusan", "Keketatan & Wilayah", "Hirarki Universitas",
+                  "Distribusi Peminat", "Semua Bagian"]
+selected_group = st.radio("Pilih bagian visualisasi:", SECTION_GROUPS, horizontal=True)
+
+def show_section(group):
+    return selected_group in (group, "Semua Bagian")
+
+# Judul bagian bernomor sekaligus batas pengukuran profiler
+def section(title):
+    profiler.start_section(title)
+    st.markdown(f"### {title}")
+
+# Grafik dirender lewat charts.py dan di-cache berdasarkan hash data masukannya
+def show_png(png):
+    if png is None:
+        st.info("Tidak ada data untuk ditampilkan dengan filter yang dipilih.")
+    else:
+        st.image(png, use_container_width=True)
+
+def show_plotly(fig, **kwargs):
+    if fig is None:
+        st.info("Tidak ada data untuk ditampilkan dengan filter yang dipilih.")
+    else:
+        st.plotly_chart(fig, **kwargs)
+
+if show_section("Peminat & Daya Tampung"):
+    # Top 10 Jurusan Peminat Terbanyak
+    section("1. 🔝 Top 10 Jurusan dengan Peminat Terendah")
+    nama_sums = get_aggregate("nama_sums", filtered_df, filter_state)
+    with timed("pandas"):
+        top_jurusan = sections.peminat_terendah(nama_sums)
+    show_png(render_png("peminat_terendah", top_jurusan))
+    st.markdown("###### Keterangan: Grafik “Jurusan dengan Peminat Terendah” menampilkan sepuluh program studi dengan jumlah peminat paling sedikit, sebagian hanya 1-3 orang. Jurusan seperti Agrowisata Bahari, Budidaya Ternak, Tanaman Pangan, Pengelola Hutan, dan Ilmu Perpustakaan termasuk dalam daftar ini, kebanyakan terkait pertanian, kehutanan, perikanan, dan konservasi lingkungan.")
+
+
+    # Daya Tampung
+    section("2. 📚 Top 10 Jurusan dengan Daya Tampung Tertinggi")
+    with timed("pandas"):
+        top_daya = sections.daya_tampung(nama_sums)
+    show_png(render_png("daya_tampung", top_daya))
+    st.markdown("###### Keterangan: Visualisasi sepuluh jurusan saintek dengan daya tampung terbanyak di PTN Indonesia menunjukkan bahwa jurusan sains murni seperti Fisika, Biologi, Matematika, dan Kimia tetap memiliki daya tampung besar meskipun peminatnya sedikit. Teknik Elektro, Budidaya Perairan, dan Ilmu Kelautan tampil di dua grafik, tetapi daya tampungnya lebih kecil dari jumlah peminat, menandakan seleksi yang ketat. Pendidikan Kimia dan Teknik Mesin juga memiliki daya tampung tinggi tetapi tidak masuk daftar terfavorit, menunjukkan persaingan yang lebih longgar. ")
+
+
+    # Pie Chart Jenjang
+    section("3. 🏫 Distribusi Jenjang Pendidikan")
+    with timed("pandas"):
+        jenjang_count = sections.jenjang_count(filtered_df)
+    show_png(render_png("jenjang_pie", jenjang_count))
+    st.markdown("###### Keterangan: Visualisasi menunjukkan distribusi jenjang pendidikan berdasarkan data. Berdasarkan visualisasi tersebut, Mayoritas program studi berada pada jenjang S1 (86,7%), sedangkan jenjang D3 dan D4 masing-masing hanya mencakup 8,9% dan 4,4%. Ini menunjukkan fokus utama institusi adalah pada pendidikan sarjana (S1). ")
+
+
+    section("4. Perbandingan Peminat dengan Daya Tampung")
+    # Hitung Top 8 dan Bottom 8 berdasarkan jumlah peminat
+    with timed("pandas"):
+        top_8, bottom_8 = sections.dual_bar(nama_sums)
+    # Tampilkan grafik untuk top 8
+    show_png(render_png("dual_bar", top_8))
+    # Tampilkan grafik untuk bottom 8
+    show_png(render_png("dual_bar", bottom_8))
+
+    st.markdown("###### Keterangan: Visualisasi menunjukkan semua jurusan memiliki peminat melebihi kapasitas, dengan jurusan seperti Fisika, Biologi, dan Matematika menunjukkan persaingan sangat ketat. Bahkan jurusan dengan peminat lebih sedikit, seperti Budidaya Perairan dan Ilmu Kelautan, tetap menunjukkan kompetisi tinggi akibat daya tampung terbatas, menandakan tingginya minat yang belum sejalan dengan kapasitas tersedia. Visualisasi menunjukkan bahwa banyak jurusan, seperti Budidaya Ternak, Tanaman Pangan, dan Tanaman Perkebunan, memiliki daya tampung sekitar 56 orang tetapi diminati hanya 1-3 orang, menunjukkan kurangnya minat calon mahasiswa. Demikian pula, jurusan seperti Agrowisata Bahari, Pengelola Hutan, dan Teknologi Budidaya Perikanan menunjukkan ketimpangan serupa, dengan kapasitas besar tetapi minim peminat. ")
+
+
+if show_section("Gaji Lulusan"):
+    section("5. Top 10 Jurusan dengan Rata-rata Gaji Tertinggi")
+    # Cek apakah kolom gaji tersedia
+    if 'rata-rata_gaji_lulusan' in df.columns:
+        # Gaji sudah berupa angka rupiah sejak dimuat (lihat data_loader.py)
+        with timed("pandas"):
+            # Top 10 jurusan dengan gaji tertinggi
+            top_gaji_langsung = sections.gaji_tertinggi(filtered_df)
+        # Tampilkan tabel
+        st.dataframe(top_gaji_langsung.rename(columns={"nama": "Jurusan", "gaji_bersih": "Gaji (Rp)"}))
+        # Visualisasi bar chart horizontal
+        show_png(render_png("gaji_tertinggi", top_gaji_langsung))
+    else:
+        st.warning("Kolom 'rata-rata_gaji_lulusan' tidak ditemukan dalam dataset. Harap periksa kembali nama kolom.")
+
+    section("💰 Jurusan dengan Rata-Rata Gaji Lulusan Tertinggi")
+    with timed("pandas"):
+        top_gaji = sections.gaji_rata_rata(filtered_df)
+    show_png(render_png("gaji_rata_rata", top_gaji))
+
+    section("📦 Distribusi Gaji Lulusan Berdasarkan Jenjang")
+    with timed("pandas"):
+        gaji_jenjang = sections.gaji_jenjang(filtered_df)
+    show_png(render_png("gaji_boxplot", gaji_jenjang))
+    st.markdown("###### Keterangan: Visualisasi ini menunjukkan 10 jurusan dengan gaji bersih tertinggi, tanpa memperhitungkan rata-rata. Kehutanan berada di puncak dengan Rp14 juta, diikuti Kimia Rp12,5 juta, dan Ilmu Tanah muncul dua kali dengan Rp12 juta, menunjukkan variasi gaji dalam jurusan yang sama. Jurusan lain seperti Ilmu Kelautan, Teknik Elektro, dan Teknik Listrik juga menawarkan gaji tinggi. Bahkan jurusan yang kurang diminati seperti Budidaya Peternakan, Akuakultur, dan Proteksi Tanaman tetap memberikan gaji kompetitif sekitar Rp9-9,5 juta, menandakan prospek kerja yang menjanjikan meskipun minatnya rendah. ")
+
+
+if show_section("Keketatan & Wilayah"):
+    # Heatmap Provinsi
+    if 'provinsi' in df.columns:
+        section("6. 🗺️ Heatmap Peminat per Provinsi")
+        # Tanpa filter yang membatasi baris, agregat seluruh data (dari store bila ada) yang dipakai
+        provinsi_key = all_data_key(data_version) if len(selected_rows) == len(df) else filter_state
+        provinsi_data = get_aggregate("provinsi_peminat", filtered_df, provinsi_key)
+        with timed("pandas"):
+            provinsi_data = provinsi_data.reset_index()
+        show_png(render_png("heatmap_provinsi", provinsi_data))
+    st.markdown("###### Keterangan: Heatmap jumlah peminat berdasarkan provinsi di Indonesia menunjukkan bahwa Lampung memiliki peminat terbanyak, dengan warna paling gelap. Aceh, Jawa Tengah, dan Jawa Timur juga menunjukkan tingkat peminat tinggi, sedangkan Banten, Maluku, dan Sulawesi Barat menunjukkan jumlah peminat yang lebih rendah, terlihat dari warna yang lebih terang. ")
+
+
+    # Scatter Plot Keketan vs Gaji
+    # st.markdown("### 7. 💵 Gaji vs Keketatan")
+    # scatter_df = filtered_df[['rasio_keketatan', 'rata-rata_gaji_lulusan', 'nama']].dropna()
+    # scatter_df['rasio_keketatan'] = pd.to_numeric(scatter_df['rasio_keketatan'], errors='coerce')
+    # scatter_df['rata-rata_gaji_lulusan'] = pd.to_numeric(scatter_df['rata-rata_gaji_lulusan'], errors='coerce')
+    # scatter_df = scatter_df.dropna()
+    # fig4 = px.scatter(
+    #     scatter_df,
+    #     x='rasio_keketatan',
+    #     y='rata-rata_gaji_lulusan',
+    #     color='nama',
+    #     hover_name='nama',
+    #     title='Rasio Keketatan vs Rata-rata Gaji Lulusan',
+    #     labels={
+    #         "rasio_keketatan": "Rasio Keketatan",
+    #         "rata-rata_gaji_lulusan": "Gaji Lulusan (Rp)"
+    #     }
+    # )
+    # st.plotly_chart(fig4)
+    # st.markdown("##### Keterangan: ")
+
+
+    section("8. Top 20 Jurusan dengan Rasio Keketatan Tertinggi")
+    # Pastikan kolom yang dibutuhkan ada
+    if 'rasio_keketatan' in df.columns and 'nama' in df.columns:
+        # Urutkan data berdasarkan rasio keketatan tertinggi
+        top_rasio = chart_input("rasio_tertinggi", data_version, df)
+        show_png(render_png("rasio_tertinggi", top_rasio, key=data_version))
+    else:
+        st.warning("Kolom 'rasio_keketatan' atau 'nama' tidak ditemukan dalam dataset. Harap pastikan nama kolom sesuai.")
+    st.markdown("###### Keterangan: Visualisasi ini menampilkan 20 jurusan dengan rasio keketatan tertinggi, dimana Fisika berada di posisi pertama, menandakan persaingan sangat ketat karena peminat jauh melebihi daya tampung. Jurusan lain seperti Budidaya Ternak, Tanaman Pangan, Pendidikan Fisika, Teknik Listrik, Agrowisata Bahari, dan Teknologi Perikanan juga menunjukkan tingkat persaingan tinggi. Umumnya, jurusan terkait pertanian, peternakan, dan perikanan mendominasi daftar ini, menggambarkan tingginya minat di bidang tersebut dibanding kapasitas yang tersedia.")
+
+    section("9. Rata-rata Rasio Keketatan per Universitas (Top 15)")
+    # Pastikan kolom yang dibutuhkan tersedia
+    if 'asal_univ' in df.columns and 'rasio_keketatan' in df.columns:
+        # Hitung rata-rata rasio keketatan per universitas
+        avg_rasio_univ = get_aggregate("univ_rasio_mean", df, all_data_key(data_version)).head(15)
+        show_png(render_png("rasio_univ", avg_rasio_univ, key=data_version))
+    else:
+        st.warning("Kolom 'asal_univ' atau 'rasio_keketatan' tidak ditemukan dalam dataset.")
+    st.markdown("###### Keterangan: Visualisasi ini memperlihatkan 15 universitas dengan rata-rata rasio keketatan tertinggi, yang menandakan persaingan masuk yang sangat ketat di program studi masing-masing. Universitas Papua berada di posisi teratas, menunjukkan bahwa daya tampung sangat terbatas dibandingkan minat calon mahasiswa. Diikuti oleh Politeknik Perikanan Negeri Tual, Universitas Pattimura, dan Politeknik Negeri FakFak. Mayoritas universitas dalam daftar ini berasal dari wilayah Indonesia Timur, seperti Papua, Maluku, dan Nusa Tenggara, mencerminkan tingginya minat terhadap pendidikan tinggi di daerah tersebut meskipun kapasitasnya kecil.")
+
+
+    # Bubble Chart
+    section("10. 🧼 Bubble Chart: Peminat vs Daya Tampung")
+    # Cek apakah semua kolom tersedia
+    required_columns = ["peminat", "daya_tampung_2025", "rasio_keketatan", "jenjang"]
+    if all(col in df.columns for col in required_columns):
+        # Scatter WebGL; di atas DASHBOARD_MAX_POINTS titik diagregasi ke grid di server
+        bubble_df = chart_input("bubble", data_version, df)
+        show_plotly(render_plotly("bubble", bubble_df, key=data_version), use_container_width=True)
+    else:
+        st.warning("Beberapa kolom yang dibutuhkan ('peminat', 'daya_tampung_2025', 'rasio_keketatan', 'jenjang') tidak ditemukan.")
+    st.markdown("###### Keterangan: Visualisasi ini menunjukkan bahwa jurusan dengan rasio keketatan tinggi umumnya memiliki daya tampung kecil dan tetap diminati, sehingga persaingan menjadi sangat ketat. Meskipun jurusan S1 lebih banyak, beberapa jurusan D3 dan D4 juga menunjukkan tingkat keketatan yang tinggi. Hal ini menegaskan bahwa tingkat keketatan dipengaruhi tidak hanya oleh jumlah peminat, tetapi juga oleh kapasitas daya tampung masing-masing jurusan. ")
+
+
+    section("11. Lollipop Chart: Rata-rata Rasio Keketatan per Universitas (Top 15)")
+    # Cek apakah kolom yang dibutuhkan tersedia
+    if "asal_univ" in df.columns and "rasio_keketatan" in df.columns:
+        # Hitung rata-rata rasio keketatan per universitas
+        avg_rasio_univ = get_aggregate("univ_rasio_mean", df, all_data_key(data_version)).head(15)
+        show_png(render_png("lollipop_univ", avg_rasio_univ, key=data_version))
+    else:
+        st.warning("Kolom 'asal_univ' atau 'rasio_keketatan' tidak ditemukan dalam DataFrame.")
+    st.markdown("###### Keterangan: Visualisasi ini menampilkan 15 universitas dengan rasio keketatan tertinggi. Universitas Papua berada di posisi teratas dengan rasio sekitar 16, menunjukkan tingkat persaingan sangat tinggi. Politeknik Perikanan Negeri Tual dan Universitas Pattimura juga punya rasio tinggi, mendekati 11 dan 6. Sebaliknya, universitas seperti Tadulako, Timor, dan Malikussaleh memiliki rasio di bawah 2, menandakan selektivitas lebih rendah. Grafik ini menunjukkan variasi besar dalam tingkat persaingan masuk, terutama di kawasan timur dan tengah Indonesia.")
+
+
+if show_section("Hirarki Universitas"):
+    section("12. Jumlah Peminat Per Universitas dan Jurusan")
+    # Pastikan kolom yang dibutuhkan tersedia
+    required_columns = ['asal_univ', 'nama', 'peminat', 'jenjang']
+    if all(col in df.columns for col in required_columns):
+        treemap_df = chart_input("treemap", data_version, df)
+        show_plotly(render_plotly("treemap", treemap_df, key=data_version), use_container_width=True)
+    else:
+        st.warning("Beberapa kolom yang dibutuhkan tidak ditemukan dalam DataFrame.")
+    st.markdown("###### Keterangan: Visualisasi ini menampilkan distribusi program studi sains di berbagai universitas Indonesia, dengan ukuran kotak menunjukkan jumlah program atau mahasiswa. Universitas Gadjah Mada, Diponegoro, dan Lampung memiliki keragaman terbesar, sementara jurusan Biologi, Fisika, dan Kimia paling umum. Beberapa universitas seperti Riau, Sriwijaya, dan Institut Teknologi Sumatera lebih fokus pada program tertentu. Warna-warna berbeda memudahkan identifikasi institusi, memberikan gambaran soal sebaran dan fokus program studi sains di tanah air. ")
+
+
+    section("13. Visualisasi Hirarki Universitas, Jenjang, dan Jurusan di Bali")
+    # Filter data for Bali province
+    df_bali = chart_input("sunburst", data_version, df)
+    show_plotly(render_plotly("sunburst", df_bali, key=data_version))
+    st.markdown("###### Keterangan: Diagram sunburst ini menunjukkan program studi dengan jumlah peminat rendah di Universitas Udayana dan Universitas Ganesha. Di Udayana, seluruh program sepi peminat berada di jenjang S1 dan berasal dari rumpun sains dan teknologi, seperti Ilmu Kelautan dan Fisika. Di Ganesha, program sepi peminat tersebar di jenjang S1 dan D4, terutama bidang kependidikan seperti Pendidikan IPA dan Pendidikan Fisika, serta beberapa program non-kependidikan. Secara umum, program studi dari bidang sains dan kependidikan cenderung kurang diminati di kedua universitas, menjadi bahan evaluasi untuk meningkatkan daya tarik melalui inovasi kurikulum, prospek kerja, dan promosi. ")
+
+
+if show_section("Distribusi Peminat"):
+    section("14. 📈 Histogram Distribusi Peminat")
+    show_png(render_png("histogram_peminat", df['peminat'], key=data_version))
+    # st.markdown("##### Keterangan: ")
+
 
 # ======================= FOOTER ========================
+profiler.start_section("Footer")
 st.markdown("---")
 st.markdown("""
 📌 **Kesimpulan:**  
@@ -376,36 +440,118 @@ Dibuat oleh: `Mini Time 5C` | 2025
 """)
 
 # ======================= REKOMENDASI OTOMATIS ========================
+profiler.start_section("Rekomendasi Sistem")
 st.markdown("## ✅ Rekomendasi Sistem")
 
+st.markdown("Atur bobot setiap kriteria sesuai prioritasmu; skor dihitung ulang hanya saat bobot berubah.")
+
+recommendation_weights = {}
+weight_columns = st.columns(len(recommender.criteria) + 1)
+for weight_col, name in zip(weight_columns, recommender.criteria):
+    recommendation_weights[name] = weight_col.slider(name, 0, 5, DEFAULT_WEIGHTS[name], key=f"bobot_{name}")
+top_k = weight_columns[-1].selectbox("Jumlah Rekomendasi", [5, 10, 20, 50])
+
 if filtered_df.empty:
     st.warning("⚠️ Tidak ada jurusan yang sesuai dengan filter yang dipilih.")
+elif not any(recommendation_weights.values()):
+    st.info("Beri bobot pada minimal satu kriteria untuk melihat rekomendasi.")
+else:
+    with timed("pandas"):
+        recommended_rows, recommended_scores = recommender.top_k(recommendation_weights, top_k, selected_rows)
+        rekomendasi = df.iloc[recommended_rows][
+            ['nama', 'asal_univ', 'jenjang', 'peminat', 'daya_tampung_2025', 'rasio_keketatan']
+        ].assign(skor=recommended_scores.round(3))
+    st.markdown("### 🎯 Rekomendasi Jurusan Sesuai Prioritasmu:")
+    st.dataframe(rekomendasi)
+
+
+# ======================= KLASIFIKASI ========================
+profiler.start_section("Klasifikasi Prospek")
+st.markdown("## 🤖 Klasifikasi Prospek Jurusan (Random Forest)")
+
+if model_future is None:
+    st.warning("Kolom yang dibutuhkan untuk klasifikasi tidak ditemukan dalam dataset.")
+elif not model_future.done():
+    st.info("⏳ Model sedang dilatih, prediksi akan tampil pada interaksi berikutnya.")
+elif model_future.exception() is not None:
+    st.error(f"Model gagal dilatih: {model_future.exception()}")
+elif filtered_df.empty:
+    st.warning("⚠️ Tidak ada jurusan yang sesuai dengan filter yang dipilih.")
 else:
-    lowest_peminat = filtered_df.nsmallest(5, 'peminat')
-    st.markdown("### Jurusan dengan Peminat Terendah:")
-    st.dataframe(lowest_peminat[['nama', 'asal_univ', 'peminat', 'daya_tampung_2025', 'rasio_keketatan']])
-
-    highest_ratio = filtered_df.nlargest(5, 'rasio_keketatan')
-    st.markdown("### Jurusan dengan Keketatan Tertinggi:")
-    st.dataframe(highest_ratio[['nama', 'asal_univ', 'peminat', 'daya_tampung_2025', 'rasio_keketatan']])
-
-    # Rekomendasi jurusan sepi peminat tapi prospek bagus
-    rekomendasi = filtered_df[(filtered_df['peminat'] < 50) & (filtered_df['rasio_keketatan'] < 1)]
-    if not rekomendasi.empty:
-        st.markdown("### 🎯 Rekomendasi Jurusan Sepi Peminat & Peluang Masuk Besar:")
-        st.dataframe(rekomendasi[['nama', 'asal_univ', 'peminat', 'daya_tampung_2025', 'rasio_keketatan']].sort_values(by='rasio_keketatan'))
+    # Rerun cukup mengambil baris hasil filter dari prediksi bersama
+    model = model_future.result()
+    all_predictions = load_predictions(data_version, model.data_hash, model, df)
+    with timed("pandas"):
+        predictions = df.iloc[selected_rows][['nama', 'asal_univ', 'jenjang', 'kualitas_prospek_kerja', 'sepi_peminatan']]
+        predictions = predictions.assign(**{name: values.to_numpy()[selected_rows]
+                                            for name, values in all_predictions.items()})
+        jumlah_bagus = int((predictions['prediksi_kualitas_prospek_kerja'] == "BAGUS").sum())
+        predictions = predictions.sort_values(by='peluang_kualitas_prospek_kerja', ascending=False)
+    col1, col2 = st.columns(2)
+    col1.metric("Prediksi Prospek BAGUS", jumlah_bagus)
+    # Skor out-of-bag: setiap baris dinilai hanya oleh pohon yang tidak melihatnya saat pelatihan
+    col2.metric("Akurasi Out-of-Bag", "-" if model.oob_score is None else f"{model.oob_score:.1%}")
+    st.dataframe(predictions)
+    st.markdown("###### Keterangan: Model Random Forest memprediksi kualitas prospek kerja dan status sepi peminat dari jumlah peminat, daya tampung, rasio keketatan, rata-rata gaji lulusan, dan jenjang. Kolom peluang menunjukkan keyakinan model terhadap prediksinya. Label pada data ini diturunkan dari aturan (BAGUS bila rata-rata gaji lulusan ≥ Rp5,5 juta; sepi peminat bila rasio keketatan ≤ rata-rata rasio), jadi akurasi yang tinggi berarti model berhasil mempelajari aturan tersebut, bukan bukti kemampuan memprediksi di luar data.")
+
+
+# ======================= UNDUH DATA ========================
+profiler.start_section("Unduh Data")
+st.markdown("### 📥 Unduh Hasil Pencarian")
+
+
+@st.fragment(run_every=1.0)
+def wait_for_export(future):
+    # Hanya bagian ini yang dijalankan ulang selama file disiapkan di thread pekerja
+    if future.done():
+        st.rerun()
+    st.info("⏳ File sedang disiapkan...")
+
+
+# File hanya dibuat saat diminta, bukan di setiap rerun
+export_col1, export_col2 = st.columns([3, 1])
+with export_col1:
+    export_columns = st.multiselect("Kolom yang diunduh", filtered_df.columns.tolist(),
+                                    default=filtered_df.columns.tolist())
+with export_col2:
+    export_format = st.selectbox("Format", list(FORMATS))
+export_request = (filter_state, export_format, tuple(export_columns))
+
+export_job = st.session_state.get("export_job")
+if export_job is not None and export_job["request"] != export_request:
+    # Filter, kolom, atau format berubah: file lama tidak berlaku lagi
+    discard(export_job["future"])
+    export_job = st.session_state["export_job"] = None
+elif export_job is not None and expired(export_job["future"]):
+    # File lama sudah dibersihkan karena umurnya; pengguna cukup menyiapkannya lagi
+    export_job = st.session_state["export_job"] = None
+
+if export_job is None:
+    if st.button("Siapkan File", disabled=filtered_df.empty or not export_columns):
+        export_job = st.session_state["export_job"] = {
+            "request": export_request,
+            "future": submit(filtered_df, export_format, export_columns),
+        }
+
+if export_job is not None:
+    export_future = export_job["future"]
+    if not export_future.done():
+        wait_for_export(export_future)
+    elif export_future.exception() is not None:
+        st.error(f"Gagal menyiapkan file: {export_future.exception()}")
     else:
-        st.info("Tidak ditemukan jurusan dengan peminat rendah dan rasio keketatan rendah berdasarkan filter yang kamu pilih.")
-
-
-
-
-import io
-
-csv_data = filtered_df.to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="📥 Unduh Hasil Pencarian (CSV)",
-    data=csv_data,
-    file_name='hasil_pencarian_jurusan.csv',
-    mime='text/csv'
-)
+        suffix, mime = FORMATS[export_format]
+        with open(export_future.result(), "rb") as export_file:
+            st.download_button(
+                label=f"📥 Unduh Hasil Pencarian ({export_format})",
+                data=export_file,
+                file_name=f"hasil_pencarian_jurusan{suffix}",
+                mime=mime
+            )
+
+# ======================= PROFILING ========================
+if profiler.enabled:
+    profile_records = pd.DataFrame(profiler.finish())
+    with st.expander("🛠️ Debug: Profiling per Bagian"):
+        st.caption(f"Run ID: {profiler.run_id}")
+        st.dataframe(profile_records[["section", "wall_ms", "pandas_ms", "render_ms", "rss_delta_mb", "rss_mb"]].round(2))
@@ -0,0 +1,116 @@
+"""Thumbnail foto profil yang sudah dioptimalkan.
+
+Contoh:
+    python assets.py                     # buat thumbnail semua foto di images/
+
+Foto asli (beberapa MB) diperkecil ke resolusi tampilan (2x lebar tampilan
+untuk layar HiDPI) dan disimpan sebagai WebP di ``static/thumbs``. Nama file
+berisi hash isi foto + parameter thumbnail, jadi thumbnail hanya dibuat ulang
+bila fotonya berubah. Folder ``static`` dilayani langsung oleh server Streamlit
+(``enableStaticServing``); parameter ``?v=<hash>`` pada URL membuat browser
+boleh menyimpan thumbnail dalam cache jangka panjang.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import logging
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageOps
+
+from data_loader import source_hash
+from fileutil import write_atomic
+
+SOURCE_DIR = "images"
+STATIC_DIR = "static"
+THUMB_DIR = os.path.join(STATIC_DIR, "thumbs")
+STATIC_URL = "app/static"
+DISPLAY_WIDTH = 130
+PIXEL_RATIO = 2
+THUMB_FORMAT = "WEBP"
+THUMB_QUALITY = 80
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+logger = logging.getLogger("dashboard.assets")
+_inline_warned = set()
+
+
+def resolve(path):
+    """Cari file tanpa membedakan huruf besar/kecil (mis. ``ardi.jpg`` vs ``ardi.JPG``)."""
+    if os.path.exists(path):
+        return path
+    directory, name = os.path.split(path)
+    for candidate in os.listdir(directory or "."):
+        if candidate.lower() == name.lower():
+            return os.path.join(directory, candidate)
+    raise FileNotFoundError(path)
+
+
+def thumbnail(path, width=DISPLAY_WIDTH * PIXEL_RATIO, fmt=THUMB_FORMAT, quality=THUMB_QUALITY,
+              thumb_dir=THUMB_DIR):
+    """Path thumbnail untuk ``path``; dibuat bila belum ada untuk isi foto ini."""
+    source = resolve(path)
+    params = f"{source_hash(source)}-{width}-{fmt}-{quality}"
+    digest = hashlib.sha256(params.encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(source))[0].lower()
+    target = os.path.join(thumb_dir, f"{stem}-{digest}.{fmt.lower()}")
+    if os.path.exists(target):
+        return target
+    return write_atomic(target, lambda tmp: render_thumbnail(source, tmp, width, fmt, quality))
+
+
+def render_thumbnail(source, out, width=DISPLAY_WIDTH * PIXEL_RATIO, fmt=THUMB_FORMAT, quality=THUMB_QUALITY):
+    # ``out`` berupa path atau objek file
+    with Image.open(source) as image:
+        # Foto ponsel sering menyimpan orientasi di EXIF; putar dulu sebelum diperkecil
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+        image.save(out, format=fmt, quality=quality, method=6 if fmt == "WEBP" else 0)
+
+
+@lru_cache(maxsize=32)
+def inline_thumbnail(source, digest, fmt=THUMB_FORMAT):
+    """Thumbnail sebagai data URI; ``digest`` (hash isi foto) hanya dipakai sebagai kunci cache."""
+    buf = io.BytesIO()
+    render_thumbnail(source, buf, fmt=fmt)
+    return f"data:image/{fmt.lower()};base64,{base64.b64encode(buf.getvalue()).decode()}"
+
+
+def static_url(target, static_dir=STATIC_DIR):
+    # Hash di nama file juga dipakai sebagai ?v= agar server mengirim header cache panjang
+    relpath = os.path.relpath(target, static_dir).replace(os.sep, "/")
+    version = os.path.splitext(relpath)[0].rsplit("-", 1)[-1]
+    return f"{STATIC_URL}/{relpath}?v={version}"
+
+
+def thumbnail_url(path):
+    source = resolve(path)
+    try:
+        return static_url(thumbnail(source))
+    except OSError as exc:
+        # static/ read-only: thumbnail dikirim inline, dibuat sekali per proses per isi foto
+        if source not in _inline_warned:
+            _inline_warned.add(source)
+            logger.warning("Thumbnail %s tidak bisa ditulis, dikirim sebagai data URI: %s", source, exc)
+        return inline_thumbnail(source, source_hash(source))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buat thumbnail foto profil untuk dashboard.")
+    parser.add_argument("files", nargs="*", help=f"Foto sumber (bawaan: semua foto di {SOURCE_DIR}/)")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(
+        os.path.join(SOURCE_DIR, name) for name in os.listdir(SOURCE_DIR)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    for path in files:
+        target = thumbnail(path)
+        print(f"{path} ({os.path.getsize(resolve(path)) / 1024:.0f} KB) -> {target} "
+              f"({os.path.getsize(target) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
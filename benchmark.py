@@ -0,0 +1,276 @@
+"""Benchmark headless untuk pipeline dashboard: load -> filter -> agregasi -> render.
+
+Contoh:
+    python benchmark.py                      # data asli + sintetis 10x/100x/1000x
+    python benchmark.py --scales 1,10 --repeat 5
+    python benchmark.py --compare .benchmarks/<commit_lama>.json
+
+Data sintetis dibangkitkan dari skema kolom asli: baris asli di-bootstrap,
+``peminat`` dan ``daya_tampung_2025`` diberi jitter log-normal sehingga
+distribusinya mengikuti data asli, dan ``rasio_keketatan`` dihitung ulang
+sebagai daya tampung / peminat seperti pada data sumber. Nama jurusan dan PTN
+diberi sufiks agar jumlah nilai unik ikut bertambah seiring skala.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from aggregates import AGGREGATES
+from charts import PLOTLY_RENDERERS, RENDERERS, figure_to_png
+from classifier import ProspectModel
+from clustering import IncrementalClusters, program_features
+from data_loader import DATA_PATH, load_dataset, read_csv, snapshot_path, write_snapshot
+from filter_index import FilterIndex
+from recommend import DEFAULT_WEIGHTS, RecommendationEngine
+from search_index import SearchIndex
+
+RESULTS_DIR = ".benchmarks"
+DEFAULT_SCALES = (1, 10, 100, 1000)
+
+# Kolom CSV sumber (sebelum normalisasi) untuk menulis data sintetis
+RAW_COLUMNS = {
+    "no": "No",
+    "provinsi": "Provinsi",
+    "asal_univ": "Nama PTN",
+    "jenjang": "Jenjang",
+    "nama": "Jurusan",
+    "peminat": "Jumlah Peminat ",
+    "daya_tampung_2025": "Daya Tampung (Tahun 2025)",
+    "rasio_keketatan": "Rasio Keketatan",
+    "rata-rata_rasio": "Rata-Rata Rasio",
+    "sepi_peminatan": "Sepi Peminatan",
+    "rata-rata_gaji_lulusan": "Rata-Rata Gaji Lulusan",
+    "kualitas_prospek_kerja": "Kualitas Prospek Kerja",
+    "prospek_kerja": "Prospek Kerja",
+}
+
+
+def synthesize(base, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(base) * scale
+    rows = rng.integers(0, len(base), size=n)
+    df = base.iloc[rows].reset_index(drop=True)
+    df = df.astype({col: str for col in ("provinsi", "asal_univ", "jenjang", "nama", "kualitas_prospek_kerja")})
+    if scale > 1:
+        # Kardinalitas jurusan dan PTN tumbuh bersama skala data
+        variant = rng.integers(0, scale, size=n).astype(str)
+        df["nama"] = df["nama"] + " " + variant
+        df["asal_univ"] = df["asal_univ"] + " " + pd.Series(rng.integers(0, max(scale // 10, 1), size=n)).astype(str)
+    jitter = lambda size: rng.lognormal(0.0, 0.25, size=size)
+    df["peminat"] = np.maximum(1, np.rint(df["peminat"] * jitter(n))).astype("int64")
+    df["daya_tampung_2025"] = np.maximum(1, np.rint(df["daya_tampung_2025"] * jitter(n))).astype("int64")
+    df["rasio_keketatan"] = df["daya_tampung_2025"] / df["peminat"]
+    df["no"] = np.arange(1, n + 1)
+    return df
+
+
+def write_raw_csv(df, path):
+    raw = df.rename(columns=RAW_COLUMNS)
+    raw["Rata-Rata Gaji Lulusan"] = raw["Rata-Rata Gaji Lulusan"].map(lambda v: f"Rp{v:,}")
+    raw["Sepi Peminatan"] = raw["Sepi Peminatan"].map({True: "TRUE", False: "FALSE"})
+    raw.to_csv(path, index=False)
+
+
+# ======================= TAHAPAN PIPELINE ========================
+def stage_load_csv(ctx):
+    ctx["df"] = read_csv(ctx["csv"])
+
+
+def stage_write_snapshot(ctx):
+    write_snapshot(ctx["df"], snapshot_path(ctx["csv"], ctx["snapshot_dir"]))
+
+
+def stage_load_snapshot(ctx):
+    ctx["df"] = load_dataset(ctx["csv"], ctx["snapshot_dir"])
+
+
+def stage_build_indexes(ctx):
+    ctx["filter_index"] = FilterIndex(ctx["df"])
+    ctx["search_index"] = SearchIndex(ctx["df"])
+
+
+def stage_filter(ctx):
+    # Skenario interaksi tipikal: cari kata kunci, pilih jenjang, geser slider peminat
+    df = ctx["df"]
+    filter_index, search_index = ctx["filter_index"], ctx["search_index"]
+    search_index.mask.cache_clear()
+    filter_index.between.cache_clear()
+    low, high = np.percentile(df["peminat"], [10, 90])
+    rows = filter_index.select([
+        filter_index.from_mask(search_index.mask("teknik")),
+        filter_index.equals("jenjang", "S1"),
+        filter_index.between("peminat", low, high),
+        filter_index.between("daya_tampung_2025", df["daya_tampung_2025"].min(), df["daya_tampung_2025"].max()),
+    ])
+    ctx["filtered"] = df.iloc[rows]
+
+
+def stage_aggregate(ctx):
+    ctx["aggregates"] = {name: compute(ctx["filtered"]) for name, compute in AGGREGATES.items()}
+
+
+def stage_render(ctx):
+    # Render langsung (tanpa cache) untuk mengukur biaya gambar sesungguhnya
+    df, agg = ctx["df"], ctx["aggregates"]
+    nama_sums = agg["nama_sums"]
+    inputs = {
+        "peminat_terendah": nama_sums["peminat"].sort_values().head(10),
+        "daya_tampung": nama_sums["daya_tampung_2025"].sort_values(ascending=False).head(10),
+        "dual_bar": (nama_sums.sort_values(by="peminat").head(8), "Bottom 8"),
+        "heatmap_provinsi": agg["provinsi_peminat"].reset_index(),
+        "rasio_univ": AGGREGATES["univ_rasio_mean"](df).head(15),
+        "histogram_peminat": df["peminat"],
+    }
+    ctx["png_bytes"] = sum(len(figure_to_png(RENDERERS[name](data))) for name, data in inputs.items()
+                           if not getattr(data, "empty", False))
+    # Grafik interaktif: ukuran JSON yang dikirim ke browser setelah downsampling
+    plotly_inputs = {
+        "bubble": df[["nama", "peminat", "daya_tampung_2025", "rasio_keketatan", "jenjang"]],
+        "treemap": df[["asal_univ", "nama", "peminat", "jenjang"]],
+        "sunburst": df[["asal_univ", "jenjang", "nama", "peminat"]],
+    }
+    ctx["figure_bytes"] = sum(len(PLOTLY_RENDERERS[name](data).to_json()) for name, data in plotly_inputs.items())
+
+
+def stage_predict(ctx):
+    # Model dilatih sekali di luar pengukuran; yang diukur hanya skor batch
+    ctx["predictions"] = ctx["model"].predict(ctx["filtered"])
+
+
+def stage_cluster(ctx):
+    # Fit penuh dari state kosong (kasus terburuk), lalu penugasan seluruh baris
+    features = program_features(ctx["df"])
+    model = IncrementalClusters()
+    model.update(features)
+    ctx["clusters"] = model.predict(features)
+
+
+def stage_recommend(ctx):
+    # Matriks kriteria dibangun sekali; yang diukur skor untuk bobot baru + top-k hasil filter
+    if "recommender" not in ctx:
+        ctx["recommender"] = RecommendationEngine(ctx["df"])
+    recommender = ctx["recommender"]
+    recommender.scores.cache_clear()
+    rows = ctx["df"].index.get_indexer(ctx["filtered"].index)
+    ctx["recommendations"] = recommender.top_k(DEFAULT_WEIGHTS, 10, rows)
+
+
+STAGES = [
+    ("load_csv", stage_load_csv),
+    ("write_snapshot", stage_write_snapshot),
+    ("load_snapshot", stage_load_snapshot),
+    ("build_indexes", stage_build_indexes),
+    ("filter", stage_filter),
+    ("aggregate", stage_aggregate),
+    ("render", stage_render),
+    ("predict", stage_predict),
+    ("cluster", stage_cluster),
+    ("recommend", stage_recommend),
+]
+
+
+def measure(stage, ctx, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        stage(ctx)
+        times.append(time.perf_counter() - start)
+    # Puncak memori diukur di putaran terpisah karena tracemalloc memperlambat eksekusi
+    gc.collect()
+    tracemalloc.start()
+    stage(ctx)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"wall_s": min(times), "wall_mean_s": sum(times) / len(times), "peak_mb": peak / 2**20}
+
+
+def run_dataset(label, csv_path, repeat, workdir, model):
+    ctx = {"csv": csv_path, "snapshot_dir": os.path.join(workdir, "snapshot"), "model": model}
+    stages = {}
+    for name, stage in STAGES:
+        stages[name] = measure(stage, ctx, repeat)
+        print(f"  {label:>8} {name:<15} {stages[name]['wall_s'] * 1000:10.2f} ms {stages[name]['peak_mb']:10.2f} MB")
+    # Ukuran keluaran render: PNG matplotlib dan JSON plotly yang dikirim ke browser
+    output = {"png_bytes": ctx["png_bytes"], "figure_bytes": ctx["figure_bytes"]}
+    print(f"  {label:>8} {'output':<15} {output['png_bytes'] / 1024:10.1f} KB PNG {output['figure_bytes'] / 1024:7.1f} KB JSON")
+    return {"rows": len(ctx["df"]), "stages": stages, "output": output}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nPerbandingan terhadap {baseline.get('commit')} ({baseline_path}):")
+    for label, result in current["datasets"].items():
+        old = baseline["datasets"].get(label)
+        if old is None:
+            continue
+        for name, stats in result["stages"].items():
+            if name in old["stages"] and old["stages"][name]["wall_s"] > 0:
+                ratio = stats["wall_s"] / old["stages"][name]["wall_s"]
+                print(f"  {label:>8} {name:<15} x{ratio:6.2f} waktu   "
+                      f"{stats['peak_mb'] - old['stages'][name]['peak_mb']:+9.2f} MB")
+        if "output" in old:
+            print(f"  {label:>8} {'output':<15} {(result['output']['figure_bytes'] - old['output']['figure_bytes']) / 1024:+9.1f} KB JSON")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="Faktor skala data sintetis, dipisah koma (1 = data asli)")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per tahap")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="File JSON hasil (bawaan: .benchmarks/<commit>.json)")
+    parser.add_argument("--compare", help="File JSON hasil benchmark lain sebagai pembanding")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    result = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "datasets": {},
+    }
+    base = read_csv(DATA_PATH)
+    model = ProspectModel.fit(base)
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in (int(s) for s in args.scales.split(",")):
+            label = "asli" if scale == 1 else f"{scale}x"
+            if scale == 1:
+                csv_path = DATA_PATH
+            else:
+                csv_path = os.path.join(workdir, f"sintetis_{scale}x.csv")
+                write_raw_csv(synthesize(base, scale, args.seed), csv_path)
+            result["datasets"][label] = run_dataset(label, csv_path, args.repeat, workdir, model)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nHasil disimpan ke {output}")
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""Renderer grafik dashboard dengan cache hasil render.
+
+Setiap grafik adalah fungsi murni ``data -> Figure``. Hasil render (PNG untuk
+matplotlib, objek figure untuk plotly) disimpan di cache LRU dengan kunci
+hash dari data masukannya, sehingga grafik hanya digambar ulang bila
+agregat masukannya benar-benar berubah. Figure matplotlib dibuat lewat
+``matplotlib.figure.Figure`` (bukan pyplot) agar tidak tertahan di registry
+global pyplot, lalu dibersihkan segera setelah disimpan ke PNG.
+"""
+import hashlib
+import io
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import seaborn as sns
+from matplotlib.figure import Figure
+
+from aggregates import AggregateCache
+from profiling import timed
+
+logger = logging.getLogger("dashboard.charts")
+
+_png_cache = AggregateCache(maxsize=128)
+_plotly_cache = AggregateCache(maxsize=32)
+
+# Batas grafik interaktif: di atas batas ini titik/simpul diagregasi di server
+MAX_POINTS = int(os.environ.get("DASHBOARD_MAX_POINTS", 5000))
+MAX_NODES = int(os.environ.get("DASHBOARD_MAX_NODES", 400))
+# Batas keras ukuran JSON figure yang dikirim ke browser
+MAX_FIGURE_BYTES = int(os.environ.get("DASHBOARD_MAX_FIGURE_BYTES", 1_000_000))
+OTHER_LABEL = "Lainnya"
+
+
+def data_hash(data):
+    # Hash isi data (nilai, indeks, dan nama kolom) untuk kunci cache render
+    digest = hashlib.sha1()
+    parts = data if isinstance(data, tuple) else (data,)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            names = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(list(names)).encode())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def _is_empty(data):
+    parts = data if isinstance(data, tuple) else (data,)
+    return any(isinstance(p, (pd.DataFrame, pd.Series)) and p.empty for p in parts)
+
+
+def figure_to_png(fig, dpi=100):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    # Lepas semua artist agar memori figure langsung bisa dibebaskan
+    fig.clear()
+    return buf.getvalue()
+
+
+def render_png(name, data, key=None):
+    """Render grafik matplotlib ``name`` menjadi PNG; ``None`` bila datanya kosong.
+
+    ``key`` bisa diberikan bila pemanggil sudah punya kunci yang stabil
+    (misalnya versi data untuk grafik yang memakai seluruh data), sehingga
+    hash data tidak perlu dihitung ulang.
+    """
+    if _is_empty(data):
+        return None
+    with timed("render"):
+        cache_key = (name, key if key is not None else data_hash(data))
+        return _png_cache.get_or_compute(cache_key, lambda: figure_to_png(RENDERERS[name](data)))
+
+
+def render_plotly(name, data, key=None):
+    if _is_empty(data):
+        return None
+    with timed("render"):
+        cache_key = (name, key if key is not None else data_hash(data))
+        return _plotly_cache.get_or_compute(cache_key, lambda: PLOTLY_RENDERERS[name](data))
+
+
+# ======================= GRAFIK MATPLOTLIB ========================
+def draw_peminat_terendah(top_jurusan):
+    fig = Figure(figsize=(12, 5))
+    ax = fig.subplots()
+    sns.barplot(x=top_jurusan.values, y=top_jurusan.index, palette='viridis', ax=ax)
+    ax.set_title("Top 10 Jurusan Berdasarkan Peminat")
+    ax.set_xlabel("Jumlah Peminat")
+    ax.set_ylabel("Jurusan")
+    return fig
+
+
+def draw_daya_tampung(top_daya):
+    fig = Figure(figsize=(12, 5))
+    ax = fig.subplots()
+    sns.barplot(x=top_daya.values, y=top_daya.index, palette='magma', ax=ax)
+    ax.set_title("Top 10 Jurusan Berdasarkan Daya Tampung")
+    return fig
+
+
+def draw_jenjang_pie(jenjang_count):
+    fig = Figure()
+    ax = fig.subplots()
+    ax.pie(jenjang_count, labels=jenjang_count.index, autopct='%1.1f%%', startangle=140)
+    ax.set_title("Distribusi Jenjang Pendidikan")
+    return fig
+
+
+def draw_dual_bar(data):
+    data, title = data
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    data.plot(kind='bar', ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel("Jurusan")
+    ax.set_ylabel("Jumlah")
+    ax.set_xticklabels(data.index, rotation=45, ha='right')
+    ax.legend(["Peminat", "Daya Tampung"])
+    ax.grid(True)
+    return fig
+
+
+def draw_gaji_tertinggi(top_gaji_langsung):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    sns.barplot(x='gaji_bersih', y='nama', data=top_gaji_langsung, palette='viridis', ax=ax)
+    ax.set_title("Top 10 Jurusan dengan Gaji Tertinggi")
+    ax.set_xlabel("Gaji (Rp)")
+    ax.set_ylabel("Nama Jurusan")
+    return fig
+
+
+def draw_gaji_rata_rata(top_gaji):
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.barplot(data=top_gaji, x="rata-rata_gaji_lulusan", y="nama", palette="crest", ax=ax)
+    ax.set_xlabel("Gaji (Rata-Rata)")
+    ax.set_ylabel("Jurusan")
+    return fig
+
+
+def draw_gaji_boxplot(gaji_jenjang):
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    sns.boxplot(data=gaji_jenjang, x="jenjang", y="rata-rata_gaji_lulusan", palette="pastel", ax=ax)
+    ax.set_xlabel("Jenjang")
+    ax.set_ylabel("Gaji Lulusan")
+    return fig
+
+
+def draw_heatmap_provinsi(provinsi_data):
+    heatmap_data = provinsi_data.set_index('provinsi').T
+    fig = Figure(figsize=(12, 2))
+    ax = fig.subplots()
+    sns.heatmap(heatmap_data, annot=True, cmap='YlGnBu', fmt=",.0f", cbar_kws={'label': 'Peminat'}, ax=ax)
+    ax.set_title('Jumlah Peminat per Provinsi')
+    return fig
+
+
+def draw_rasio_tertinggi(top_rasio):
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    sns.barplot(data=top_rasio, x="rasio_keketatan", y="nama", palette="viridis", ax=ax)
+    ax.set_title("Top 20 Jurusan dengan Rasio Keketatan Tertinggi", fontsize=14)
+    ax.set_xlabel("Rasio Keketatan (Peminat / Daya Tampung)", fontsize=12)
+    ax.set_ylabel("Nama Jurusan", fontsize=12)
+    return fig
+
+
+def draw_rasio_univ(avg_rasio_univ):
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.barplot(x=avg_rasio_univ.values, y=avg_rasio_univ.index, palette="mako", ax=ax)
+    ax.set_title("Rata-rata Rasio Keketatan per Universitas (Top 15)", fontsize=14)
+    ax.set_xlabel("Rata-rata Rasio Keketatan", fontsize=12)
+    ax.set_ylabel("Asal Universitas", fontsize=12)
+    return fig
+
+
+def draw_lollipop_univ(avg_rasio_univ):
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.hlines(y=avg_rasio_univ.index, xmin=0, xmax=avg_rasio_univ.values, color='skyblue')
+    ax.plot(avg_rasio_univ.values, avg_rasio_univ.index, "o", color='blue')
+    ax.set_title("Rata-rata Rasio Keketatan per Universitas (Top 15)", fontsize=14)
+    ax.set_xlabel("Rata-rata Rasio Keketatan", fontsize=12)
+    ax.set_ylabel("Asal Universitas", fontsize=12)
+    ax.grid(axis='x', linestyle='--', alpha=0.5)
+    fig.tight_layout()
+    return fig
+
+
+def draw_histogram_peminat(peminat):
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    sns.histplot(peminat, bins=30, kde=True, color='skyblue', ax=ax)
+    ax.set_xlabel("Jumlah Peminat")
+    ax.set_ylabel("Frekuensi")
+    return fig
+
+
+RENDERERS = {
+    "peminat_terendah": draw_peminat_terendah,
+    "daya_tampung": draw_daya_tampung,
+    "jenjang_pie": draw_jenjang_pie,
+    "dual_bar": draw_dual_bar,
+    "gaji_tertinggi": draw_gaji_tertinggi,
+    "gaji_rata_rata": draw_gaji_rata_rata,
+    "gaji_boxplot": draw_gaji_boxplot,
+    "heatmap_provinsi": draw_heatmap_provinsi,
+    "rasio_tertinggi": draw_rasio_tertinggi,
+    "rasio_univ": draw_rasio_univ,
+    "lollipop_univ": draw_lollipop_univ,
+    "histogram_peminat": draw_histogram_peminat,
+}
+
+
+# ======================= GRAFIK PLOTLY ========================
+def placeholder_figure(message):
+    fig = go.Figure(layout={"template": "none"})
+    fig.add_annotation(text=message, showarrow=False, x=0.5, y=0.5, xref="paper", yref="paper")
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(visible=False)
+    return fig
+
+
+def fit_to_budget(build, budget, max_bytes=MAX_FIGURE_BYTES, min_budget=16):
+    """Bangun figure dengan ``build(budget)``; anggaran dipangkas separuh sampai JSON-nya muat.
+
+    Bila pada ``min_budget`` pun masih melebihi ``max_bytes``, yang dikirim adalah figure
+    pengganti berisi pesan, sehingga batas ukuran tetap berlaku.
+    """
+    while True:
+        fig = build(budget)
+        size = len(fig.to_json())
+        if size <= max_bytes:
+            return fig
+        if budget <= min_budget:
+            logger.warning("Figure %d byte melebihi batas %d byte pada anggaran minimum %d, diganti placeholder",
+                           size, max_bytes, budget)
+            return placeholder_figure(f"Grafik terlalu besar untuk ditampilkan ({size:,} byte > batas {max_bytes:,} byte)")
+        budget //= 2
+
+
+def bin_points(df, x, y, max_points, by=None):
+    """Level-of-detail: gabungkan titik ke grid 2D sehingga jumlah titik <= ``max_points``."""
+    groups = [by] if by else []
+    bins = max(int(np.sqrt(max_points / max(df[by].nunique() if by else 1, 1))), 2)
+    x_bin = pd.cut(df[x], bins=bins, labels=False, include_lowest=True)
+    y_bin = pd.cut(df[y], bins=bins, labels=False, include_lowest=True)
+    binned = df.groupby(groups + [x_bin.rename("x_bin"), y_bin.rename("y_bin")], observed=True)
+    return binned.agg(
+        **{x: (x, "mean"), y: (y, "mean"), "rasio_keketatan": ("rasio_keketatan", "mean"),
+           "jumlah": (x, "size")}
+    ).reset_index()
+
+
+def collapse_hierarchy(df, path, value, max_nodes, color=None):
+    """Agregasi hirarki; di atas ``max_nodes`` hanya top-N anak per induk yang dipertahankan.
+
+    Anak lain digabung menjadi simpul "Lainnya" sehingga ukuran figure tidak
+    lagi tumbuh bersama jumlah baris.
+    """
+    columns = path + ([color] if color else [])
+    data = df[columns + [value]].astype({col: str for col in columns})
+    agg = {value: (value, "sum")}
+    if color:
+        agg.update(_color=(color, "first"), _colors=(color, "nunique"))
+    grouped = data.groupby(path).agg(**agg).reset_index()
+    if color:
+        # Simpul dengan lebih dari satu warna (jenjang) diberi warna "Lainnya"
+        grouped[color] = grouped.pop("_color").where(grouped.pop("_colors") == 1, OTHER_LABEL)
+        agg = {value: (value, "sum"), color: (color, lambda v: v.iloc[0] if v.nunique() == 1 else OTHER_LABEL)}
+    if len(grouped) <= max_nodes:
+        return grouped
+    per_level = max(2, int(np.ceil(max_nodes ** (1 / len(path)))))
+    for depth, col in enumerate(path):
+        parents = path[:depth]
+        totals = grouped.groupby(parents + [col])[value].transform("sum")
+        # Peringkat anak di dalam induknya berdasarkan total nilai
+        ranked = grouped.assign(_total=totals).drop_duplicates(parents + [col])
+        rank = (ranked.groupby(parents)["_total"] if parents else ranked["_total"]).rank(
+            method="first", ascending=False)
+        kept = ranked.loc[rank <= per_level, parents + [col]]
+        is_kept = pd.MultiIndex.from_frame(grouped[parents + [col]]).isin(pd.MultiIndex.from_frame(kept))
+        grouped.loc[~is_kept, path[depth:]] = OTHER_LABEL
+        if not is_kept.all():
+            grouped = pd.concat([
+                grouped[is_kept],
+                grouped[~is_kept].groupby(path).agg(**agg).reset_index(),
+            ], ignore_index=True)
+    return grouped
+
+
+def draw_bubble(bubble_df, max_points=None):
+    """Bubble chart WebGL (Scattergl); di atas ``MAX_POINTS`` titik dibin di server."""
+    max_points = MAX_POINTS if max_points is None else max_points
+
+    def build(budget):
+        data = bubble_df
+        binned = len(data) > budget
+        if binned:
+            data = bin_points(bubble_df, "peminat", "daya_tampung_2025", budget, by="jenjang")
+        sizeref = 2.0 * max(float(data["rasio_keketatan"].max()), 1e-9) / (40 ** 2)
+        fig = go.Figure()
+        for jenjang, part in data.groupby("jenjang", observed=True):
+            if binned:
+                hover = [f"{n} jurusan<br>rata-rata rasio {r:.2f}" for n, r in zip(part["jumlah"], part["rasio_keketatan"])]
+            else:
+                hover = [f"{nama}<br>rasio {r:.2f}" for nama, r in zip(part["nama"], part["rasio_keketatan"])]
+            fig.add_trace(go.Scattergl(
+                x=part["peminat"], y=part["daya_tampung_2025"], mode="markers", name=str(jenjang),
+                text=hover, hoverinfo="text+x+y",
+                marker=dict(size=part["rasio_keketatan"], sizemode="area", sizeref=sizeref, sizemin=3, opacity=0.6),
+            ))
+        title = "Bubble Chart Rasio Keketatan per Jurusan"
+        if binned:
+            title += f" (diagregasi ke {len(data):,} titik dari {len(bubble_df):,} baris)"
+        fig.update_layout(title=title, xaxis_title="Jumlah Peminat", yaxis_title="Daya Tampung",
+                          legend_title="Jenjang", colorway=px.colors.qualitative.Set3)
+        return fig
+
+    return fit_to_budget(build, max_points)
+
+
+def draw_treemap(treemap_df, max_nodes=None):
+    def build(budget):
+        data = collapse_hierarchy(treemap_df, ['asal_univ', 'nama'], 'peminat', budget, color='jenjang')
+        return px.treemap(
+            data,
+            path=['asal_univ', 'nama'],
+            values='peminat',
+            color='jenjang',
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+
+    return fit_to_budget(build, MAX_NODES if max_nodes is None else max_nodes)
+
+
+def draw_sunburst(df_bali, max_nodes=None):
+    def build(budget):
+        data = collapse_hierarchy(df_bali, ['asal_univ', 'jenjang', 'nama'], 'peminat', budget)
+        fig = px.sunburst(
+            data,
+            path=['asal_univ', 'jenjang', 'nama'],  # Hierarchy: University > Level > Major
+            values='peminat',
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+        fig.update_layout(margin=dict(t=50, l=0, r=0, b=0))
+        return fig
+
+    return fit_to_budget(build, MAX_NODES if max_nodes is None else max_nodes)
+
+
+PLOTLY_RENDERERS = {
+    "bubble": draw_bubble,
+    "treemap": draw_treemap,
+    "sunburst": draw_sunburst,
+}
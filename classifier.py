@@ -0,0 +1,141 @@
+"""Klasifikasi prospek jurusan dengan Random Forest.
+
+Contoh:
+    python classifier.py                 # latih (atau muat) model untuk data saat ini
+    python classifier.py --retrain       # paksa latih ulang
+
+Satu model multi-output memprediksi ``kualitas_prospek_kerja`` dan
+``sepi_peminatan`` dari peminat, daya tampung, rasio keketatan, gaji lulusan,
+dan jenjang. Model disimpan di ``models/`` dengan nama berisi hash data latih,
+sehingga hanya dilatih ulang bila data berubah. Prediksi dilakukan sekaligus
+untuk seluruh DataFrame dalam satu pemanggilan ``predict_proba``.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from data_loader import DATA_PATH, SALARY_COLUMN, load_dataset
+from fileutil import write_atomic
+
+MODEL_DIR = "models"
+NUMERIC_FEATURES = ["peminat", "daya_tampung_2025", "rasio_keketatan", SALARY_COLUMN]
+CATEGORY_FEATURE = "jenjang"
+FEATURES = NUMERIC_FEATURES + [CATEGORY_FEATURE]
+TARGETS = ["kualitas_prospek_kerja", "sepi_peminatan"]
+PREDICTION_COLUMNS = [f"{prefix}_{target}" for target in TARGETS for prefix in ("prediksi", "peluang")]
+RF_PARAMS = {"n_estimators": 200, "min_samples_leaf": 2, "random_state": 42}
+
+logger = logging.getLogger("dashboard.classifier")
+
+# Pelatihan di latar belakang: satu pekerja cukup karena Random Forest sendiri paralel (n_jobs)
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classifier")
+
+
+def training_hash(df):
+    # Hash isi kolom fitur + target dan parameter model, bukan path file
+    digest = hashlib.sha256(repr(sorted(RF_PARAMS.items())).encode())
+    digest.update(pd.util.hash_pandas_object(df[FEATURES + TARGETS].astype(str), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def model_path(digest, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f"rf-{digest[:16]}.joblib")
+
+
+class ProspectModel:
+    def __init__(self, estimator, jenjang_levels, salary_fill, data_hash):
+        self.estimator = estimator
+        self.jenjang_levels = jenjang_levels
+        self.salary_fill = salary_fill
+        self.data_hash = data_hash
+
+    @staticmethod
+    def matrix(df, jenjang_levels, salary_fill):
+        """Matriks fitur numerik + one-hot jenjang dengan urutan kolom tetap."""
+        numeric = df[NUMERIC_FEATURES].astype("float64").fillna({SALARY_COLUMN: salary_fill}).to_numpy()
+        jenjang = df[CATEGORY_FEATURE].astype(str).to_numpy()
+        one_hot = (jenjang[:, None] == np.asarray(jenjang_levels)[None, :]).astype("float64")
+        return np.hstack([numeric, one_hot])
+
+    @classmethod
+    def fit(cls, df, n_jobs=-1):
+        data = df.dropna(subset=TARGETS)
+        jenjang_levels = sorted(data[CATEGORY_FEATURE].astype(str).unique())
+        salary_fill = float(data[SALARY_COLUMN].median())
+        X = cls.matrix(data, jenjang_levels, salary_fill)
+        y = data[TARGETS].astype(str).to_numpy()
+        estimator = RandomForestClassifier(n_jobs=n_jobs, oob_score=True, **RF_PARAMS)
+        estimator.fit(X, y)
+        return cls(estimator, jenjang_levels, salary_fill, training_hash(df))
+
+    @property
+    def oob_score(self):
+        return getattr(self.estimator, "oob_score_", None)
+
+    def predict(self, df):
+        """Prediksi seluruh baris ``df`` sekaligus; kembalikan DataFrame dengan index yang sama."""
+        result = pd.DataFrame(index=df.index)
+        if df.empty:
+            for target in TARGETS:
+                result[f"prediksi_{target}"] = pd.Series(dtype="string")
+                result[f"peluang_{target}"] = pd.Series(dtype="float64")
+            return result
+        probas = self.estimator.predict_proba(self.matrix(df, self.jenjang_levels, self.salary_fill))
+        for target, classes, proba in zip(TARGETS, self.estimator.classes_, probas):
+            best = proba.argmax(axis=1)
+            result[f"prediksi_{target}"] = classes[best]
+            result[f"peluang_{target}"] = proba[np.arange(len(best)), best]
+        return result
+
+
+def save_model(model, path):
+    write_atomic(path, lambda tmp: joblib.dump(model, tmp))
+
+
+def load_or_train(df, model_dir=MODEL_DIR, n_jobs=-1, retrain=False):
+    """Muat model untuk data ini dari disk; latih dan simpan bila belum ada."""
+    path = model_path(training_hash(df), model_dir)
+    if os.path.exists(path) and not retrain:
+        return joblib.load(path)
+    model = ProspectModel.fit(df, n_jobs=n_jobs)
+    try:
+        save_model(model, path)
+    except OSError as exc:
+        # Direktori read-only: model tetap dipakai tanpa disimpan
+        logger.warning("Model tidak bisa disimpan ke %s, dipakai tanpa disimpan: %s", path, exc)
+    return model
+
+
+def submit_training(df, model_dir=MODEL_DIR):
+    """Muat/latih model di thread latar belakang; kembalikan ``Future`` berisi model."""
+    return _executor.submit(load_or_train, df, model_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latih model Random Forest prospek jurusan.")
+    parser.add_argument("--data", default=DATA_PATH, help="File CSV data jurusan")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--retrain", action="store_true", help="Latih ulang meski model sudah ada")
+    args = parser.parse_args(argv)
+
+    df = load_dataset(args.data)
+    start = time.perf_counter()
+    model = load_or_train(df, args.model_dir, retrain=args.retrain)
+    elapsed = time.perf_counter() - start
+    print(f"Model {model_path(model.data_hash, args.model_dir)} siap dalam {elapsed:.2f} s, "
+          f"OOB score {model.oob_score:.3f}")
+    start = time.perf_counter()
+    model.predict(df)
+    print(f"Prediksi {len(df)} baris: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Klasterisasi jurusan dan universitas secara inkremental.
+
+Contoh:
+    python clustering.py                 # hitung (atau muat) klaster untuk data saat ini
+
+Jurusan dikelompokkan berdasarkan peminat, daya tampung, rasio keketatan, dan
+gaji lulusan; universitas berdasarkan agregat per ``asal_univ``. Fitur diskalakan
+dengan ``StandardScaler`` lalu dikelompokkan dengan ``MiniBatchKMeans``. Scaler
+hanya di-fit pada pembaruan pertama lalu dibekukan, sedangkan centroid diperbarui
+lewat ``partial_fit`` dengan baris yang belum pernah dilihat, jadi data baru (mis.
+update peminat di tengah siklus) menggeser centroid tanpa melatih ulang dari awal.
+State model disimpan per nama data (satu per tahun di store), sehingga klaster suatu
+tahun tidak bergantung pada tahun lain mana yang lebih dulu dibuka. Hasil penugasan
+klaster disimpan di samping snapshot data; hanya file untuk versi data terakhir yang
+disimpan.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+
+from data_loader import DATA_PATH, SALARY_COLUMN, SNAPSHOT_DIR, load_dataset, snapshot_stem, source_hash
+from fileutil import write_atomic
+
+N_CLUSTERS = 4
+BATCH_ROWS = 4096
+CLUSTER_COLUMNS = ("klaster_jurusan", "klaster_univ")
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clustering")
+# State model dibaca-ubah-tulis; satu pembaruan per proses dalam satu waktu
+_state_lock = threading.Lock()
+logger = logging.getLogger("dashboard.clustering")
+
+
+# ======================= FITUR ========================
+def program_features(df):
+    features = pd.DataFrame({
+        "peminat": np.log1p(df["peminat"]),
+        "daya_tampung": np.log1p(df["daya_tampung_2025"]),
+        "rasio": np.log1p(df["rasio_keketatan"]),
+    }, index=df.index)
+    if SALARY_COLUMN in df.columns:
+        features["gaji"] = df[SALARY_COLUMN].astype("float64")
+    return features
+
+
+def university_features(df):
+    grouped = df.groupby("asal_univ", observed=True)
+    features = pd.DataFrame({
+        "peminat": np.log1p(grouped["peminat"].sum()),
+        "daya_tampung": np.log1p(grouped["daya_tampung_2025"].sum()),
+        "rasio": np.log1p(grouped["rasio_keketatan"].mean()),
+        "jurusan": np.log1p(grouped.size()),
+    })
+    if SALARY_COLUMN in df.columns:
+        features["gaji"] = grouped[SALARY_COLUMN].mean().astype("float64")
+    return features
+
+
+def cluster_labels(codes, n_clusters):
+    categories = [f"Klaster {i + 1}" for i in range(n_clusters)]
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+# ======================= MODEL ========================
+class IncrementalClusters:
+    def __init__(self, n_clusters=N_CLUSTERS, random_state=42):
+        self.n_clusters = n_clusters
+        self.random_state = random_state
+        self.scaler = StandardScaler()
+        self.kmeans = None
+        self.columns = None
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def _matrix(self, features):
+        features = features[self.columns]
+        return features.fillna(features.median()).to_numpy(dtype="float64")
+
+    def update(self, features):
+        """Perbarui centroid dengan baris yang belum pernah dilihat; kembalikan jumlahnya."""
+        if self.columns is None:
+            self.columns = list(features.columns)
+        # Baris dikenali dari label index + nilai fiturnya; baris yang berubah dianggap baru
+        hashes = pd.util.hash_pandas_object(features[self.columns], index=True).to_numpy()
+        new = ~np.isin(hashes, self.seen)
+        if not new.any():
+            return 0
+        X = self._matrix(features)[new]
+        if self.kmeans is None:
+            self.kmeans = MiniBatchKMeans(n_clusters=min(self.n_clusters, len(X)), batch_size=BATCH_ROWS,
+                                          n_init=3, random_state=self.random_state)
+            # Skala hanya ditentukan oleh data pertama lalu dibekukan: centroid disimpan dalam
+            # ruang yang sudah diskalakan, jadi mengubah scaler membuat centroid lama tidak cocok lagi
+            for start in range(0, len(X), BATCH_ROWS):
+                self.scaler.partial_fit(X[start:start + BATCH_ROWS])
+        for start in range(0, len(X), BATCH_ROWS):
+            self.kmeans.partial_fit(self.scaler.transform(X[start:start + BATCH_ROWS]))
+        self.seen = np.union1d(self.seen, hashes[new])
+        return int(new.sum())
+
+    def predict(self, features):
+        """Kode klaster per baris; klaster diurutkan dari centroid peminat terendah."""
+        codes = self.kmeans.predict(self.scaler.transform(self._matrix(features)))
+        rank = np.argsort(np.argsort(self.kmeans.cluster_centers_[:, 0]))
+        return rank[codes]
+
+
+# ======================= CACHE & ENGINE ========================
+def cache_path(name, version, cache_dir=SNAPSHOT_DIR):
+    key = hashlib.sha256(version.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{name}-{key}.clusters.parquet")
+
+
+def remove_stale(name, target, cache_dir=SNAPSHOT_DIR):
+    # Hanya "<name>-<16 hex>.clusters.parquet" yang cocok, seperti snapshot di data_loader
+    pattern = re.compile(re.escape(name) + r"-[0-9a-f]{16}\.clusters\.parquet")
+    for entry in os.listdir(cache_dir):
+        old = os.path.join(cache_dir, entry)
+        if pattern.fullmatch(entry) and old != target:
+            os.remove(old)
+
+
+def state_path(name, cache_dir=SNAPSHOT_DIR):
+    return os.path.join(cache_dir, f"{name}.clusters-state.joblib")
+
+
+def compute_clusters(df, name, version, cache_dir=SNAPSHOT_DIR):
+    """Penugasan klaster per baris ``df`` (urutan posisi sama), dari cache bila ada."""
+    target = cache_path(name, version, cache_dir)
+    if os.path.exists(target):
+        return pd.read_parquet(target)
+    with _state_lock:
+        state_file = state_path(name, cache_dir)
+        if os.path.exists(state_file):
+            state = joblib.load(state_file)
+        else:
+            state = {"jurusan": IncrementalClusters(), "univ": IncrementalClusters()}
+        programs, universities = program_features(df), university_features(df)
+        state["jurusan"].update(programs)
+        state["univ"].update(universities)
+        univ_codes = pd.Series(state["univ"].predict(universities), index=universities.index)
+        result = pd.DataFrame({
+            "klaster_jurusan": cluster_labels(state["jurusan"].predict(programs), state["jurusan"].kmeans.n_clusters),
+            "klaster_univ": cluster_labels(df["asal_univ"].astype(str).map(univ_codes.rename(index=str)).to_numpy(),
+                                           state["univ"].kmeans.n_clusters),
+        })
+        try:
+            write_atomic(state_file, lambda tmp: joblib.dump(state, tmp))
+            write_atomic(target, lambda tmp: result.to_parquet(tmp, index=False))
+            remove_stale(name, target, cache_dir)
+        except OSError as exc:
+            # Direktori read-only: klaster tetap dipakai tanpa disimpan
+            logger.warning("Klaster tidak bisa disimpan ke %s, dipakai tanpa disimpan: %s", cache_dir, exc)
+    return result
+
+
+def submit_clustering(df, name, version, cache_dir=SNAPSHOT_DIR):
+    """Hitung klaster di thread latar belakang; kembalikan ``Future`` berisi DataFrame klaster."""
+    return _executor.submit(compute_clusters, df, name, version, cache_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung klaster jurusan dan universitas.")
+    parser.add_argument("--data", default=DATA_PATH, help="File CSV data jurusan")
+    parser.add_argument("--cache-dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args(argv)
+
+    df = load_dataset(args.data)
+    clusters = compute_clusters(df, snapshot_stem(args.data), source_hash(args.data), args.cache_dir)
+    for col in CLUSTER_COLUMNS:
+        print(f"{col}: " + ", ".join(f"{label} ({count})" for label, count in clusters[col].value_counts(sort=False).items()))
+
+
+if __name__ == "__main__":
+    main()
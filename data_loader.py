@@ -0,0 +1,174 @@
+"""Loader data jurusan dengan tipe kolom yang sudah dinormalisasi.
+
+CSV sumber hanya di-parse sekali: hasilnya disimpan sebagai snapshot Arrow IPC
+(Feather v2, tanpa kompresi) yang bisa di-memory-map dan dipakai ulang selama
+hash CSV sumber tidak berubah.
+
+Kolom numerik DataFrame hasil ``read_snapshot`` adalah view zero-copy atas file
+yang di-memory-map: halaman memorinya dibagi lewat page cache OS oleh semua
+sesi dan proses yang membaca snapshot yang sama, dan bersifat read-only
+(penulisan in-place akan gagal, bukan diam-diam mengubah data sesi lain).
+"""
+import hashlib
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from fileutil import write_atomic
+
+DATA_PATH = os.path.join("Data", "Data Jurusan Peminat Saintex.csv")
+SNAPSHOT_DIR = os.path.join("Data", ".snapshot")
+# Naikkan bila normalisasi kolom atau tipe data loader berubah, agar snapshot lama tidak dipakai
+LOADER_VERSION = "1"
+
+COLUMN_RENAMES = {
+    "nama_ptn": "asal_univ",
+    "jurusan": "nama",
+    "jumlah_peminat": "peminat",
+}
+# "daya_tampung_(tahun_2025)" -> "daya_tampung_2025", berlaku untuk tahun berapa pun
+CAPACITY_PATTERN = re.compile(r"daya_tampung_\(tahun_(\d{4})\)")
+SALARY_COLUMN = "rata-rata_gaji_lulusan"
+CATEGORY_COLUMNS = ["provinsi", "asal_univ", "jenjang", "nama", "kualitas_prospek_kerja"]
+COLUMN_DTYPES = {
+    "no": "int64",
+    "peminat": "int64",
+    "rasio_keketatan": "float64",
+    "rata-rata_rasio": "float64",
+    "sepi_peminatan": "bool",
+    SALARY_COLUMN: "string",
+    "prospek_kerja": "string",
+    **{col: "category" for col in CATEGORY_COLUMNS},
+}
+
+# Sel kosong di kolom bilangan bulat/boolean dibaca dengan tipe nullable; tipe numpy biasa
+# (yang bisa di-memory-map tanpa salinan) dipakai kembali bila kolomnya ternyata lengkap
+NULLABLE_DTYPES = {"int64": "Int64", "bool": "boolean"}
+
+_hash_memo = {}
+logger = logging.getLogger("dashboard.data_loader")
+
+
+def normalize_column(name):
+    name = name.strip().lower().replace(" ", "_")
+    name = CAPACITY_PATTERN.sub(r"daya_tampung_\1", name)
+    return COLUMN_RENAMES.get(name, name)
+
+
+def column_dtype(name):
+    if name.startswith("daya_tampung_"):
+        return "int64"
+    return COLUMN_DTYPES.get(name)
+
+
+def parse_rupiah(values):
+    # "Rp9,650,000" -> 9650000
+    digits = values.astype("string").str.replace(r"[^0-9]", "", regex=True)
+    parsed = pd.to_numeric(digits.replace("", pd.NA), errors="coerce")
+    return parsed.astype("int64") if parsed.notna().all() else parsed.astype("Int64")
+
+
+def source_hash(path=DATA_PATH):
+    # Hash penuh hanya dihitung ulang jika ukuran atau mtime file berubah
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def read_csv(path=DATA_PATH):
+    header = pd.read_csv(path, nrows=0).columns
+    names = {raw: normalize_column(raw) for raw in header}
+    dtypes = {raw: column_dtype(name) for raw, name in names.items() if column_dtype(name)}
+    df = pd.read_csv(path, dtype={raw: NULLABLE_DTYPES.get(d, d) for raw, d in dtypes.items()}).rename(columns=names)
+    for col in df.columns:
+        dtype = column_dtype(col)
+        if dtype not in NULLABLE_DTYPES:
+            continue
+        missing = int(df[col].isna().sum())
+        if missing:
+            logger.warning("%s: %d sel kosong di kolom %s, kolom dibaca sebagai %s", path, missing, col,
+                           NULLABLE_DTYPES[dtype])
+        else:
+            df[col] = df[col].astype(dtype)
+    if SALARY_COLUMN in df.columns:
+        df[SALARY_COLUMN] = parse_rupiah(df[SALARY_COLUMN])
+    return df
+
+
+def snapshot_stem(path=DATA_PATH):
+    return os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+
+
+def snapshot_target(stem, digest, snapshot_dir=SNAPSHOT_DIR):
+    # Kunci snapshot = versi data sumber + versi loader
+    key = hashlib.sha256(f"{LOADER_VERSION}-{digest}".encode()).hexdigest()[:16]
+    return os.path.join(snapshot_dir, f"{stem}-{key}.arrow")
+
+
+def snapshot_path(path=DATA_PATH, snapshot_dir=SNAPSHOT_DIR, digest=None):
+    return snapshot_target(snapshot_stem(path), digest or source_hash(path), snapshot_dir)
+
+
+def write_snapshot(df, target):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    write_atomic(target, lambda tmp: feather.write_feather(table, tmp, compression="uncompressed"))
+    # Snapshot lama dari CSV yang sama sudah tidak berlaku; hanya "<stem>-<16 hex>.arrow"
+    # yang cocok, jadi snapshot CSV lain dengan awalan nama serupa tidak ikut terhapus
+    stem = os.path.basename(target).rsplit("-", 1)[0]
+    pattern = re.compile(re.escape(stem) + r"-[0-9a-f]{16}\.arrow")
+    for name in os.listdir(os.path.dirname(target)):
+        old = os.path.join(os.path.dirname(target), name)
+        if pattern.fullmatch(name) and old != target:
+            os.remove(old)
+
+
+def read_snapshot(target):
+    # split_blocks: satu blok per kolom sehingga kolom numerik tidak perlu disalin
+    return feather.read_table(target, memory_map=True).to_pandas(split_blocks=True)
+
+
+def share_frame(df):
+    # Tanpa file snapshot: lewat tabel Arrow di memori, sehingga kolom numeriknya tetap
+    # view read-only seperti hasil read_snapshot (hanya tidak dibagi antar proses)
+    return pa.Table.from_pandas(df, preserve_index=False).to_pandas(split_blocks=True)
+
+
+def read_only_frame(frame):
+    """Salinan ``frame`` dengan satu array read-only per kolom, aman dibagi antar sesi."""
+    columns = {}
+    for name, values in frame.items():
+        values = np.array(values)
+        values.flags.writeable = False
+        columns[name] = values
+    # copy=False: setiap kolom tetap blok sendiri di atas array read-only di atas
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+def load_snapshot(target, build):
+    """DataFrame dari snapshot ``target``; bila belum ada, dibuat dari ``build()`` lalu dibaca balik."""
+    if os.path.exists(target):
+        return read_snapshot(target)
+    df = build()
+    try:
+        write_snapshot(df, target)
+    except OSError as exc:
+        # Direktori read-only: tetap jalan tanpa snapshot
+        logger.warning("Snapshot %s tidak bisa ditulis, data dipakai tanpa snapshot: %s", target, exc)
+        return share_frame(df)
+    # Baca balik lewat memory map agar pemanggil pertama juga memakai data bersama
+    return read_snapshot(target)
+
+
+def load_dataset(path=DATA_PATH, snapshot_dir=SNAPSHOT_DIR):
+    return load_snapshot(snapshot_path(path, snapshot_dir), lambda: read_csv(path))
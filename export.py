@@ -0,0 +1,129 @@
+"""Ekspor hasil filter ke CSV, Parquet, atau XLSX.
+
+File hanya dibuat saat pengguna memintanya, di thread pekerja (bukan thread
+skrip Streamlit), dan ditulis per potongan baris ke file sementara di disk.
+Dengan begitu tidak ada salinan penuh data dalam bentuk teks di memori sesi,
+dan rerun biasa (geser slider, ganti filter) tidak membayar biaya ekspor.
+
+Streamlit tidak memberi tahu saat sesi berakhir, jadi file milik sesi yang
+sudah ditutup dibersihkan berdasarkan umur setiap kali ekspor baru dibuat.
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = int(os.environ.get("DASHBOARD_EXPORT_CHUNK_ROWS", 50_000))
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "dashboard-export")
+EXPORT_PREFIX = "export-"
+# File ekspor yang lebih tua dari ini dianggap tertinggal dan dihapus
+MAX_AGE_S = int(os.environ.get("DASHBOARD_EXPORT_MAX_AGE_S", 3600))
+FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "XLSX": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# Satu pool kecil untuk seluruh proses agar ekspor bersamaan tidak menghabiskan CPU
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, path, chunk_rows=CHUNK_ROWS):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+            chunk.to_csv(f, index=False, header=i == 0)
+        if df.empty:
+            df.to_csv(f, index=False)
+
+
+def write_parquet(df, path, chunk_rows=CHUNK_ROWS):
+    # Setiap potongan menjadi satu row group
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(df, path, chunk_rows=CHUNK_ROWS):
+    # Mode write-only menulis baris langsung ke file tanpa menyimpan seluruh sheet
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    sheet.append(list(df.columns))
+    for chunk in iter_chunks(df, chunk_rows):
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False):
+            sheet.append(list(row))
+    workbook.save(path)
+
+
+WRITERS = {
+    "CSV": write_csv,
+    "Parquet": write_parquet,
+    "XLSX": write_xlsx,
+}
+
+
+def sweep(directory=EXPORT_DIR, max_age=MAX_AGE_S):
+    """Hapus file ekspor di ``directory`` yang lebih tua dari ``max_age`` detik."""
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if not entry.name.startswith(EXPORT_PREFIX):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            # Sudah dihapus oleh sesi atau proses lain
+            pass
+
+
+def export(df, fmt, columns=None, directory=EXPORT_DIR):
+    """Tulis ``df`` (atau subset ``columns``) ke file sementara; kembalikan path-nya."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    if columns:
+        df = df[list(columns)]
+    os.makedirs(directory, exist_ok=True)
+    sweep(directory)
+    suffix, _ = FORMATS[fmt]
+    fd, path = tempfile.mkstemp(prefix=EXPORT_PREFIX, suffix=suffix, dir=directory)
+    os.close(fd)
+    try:
+        WRITERS[fmt](df, path)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def submit(df, fmt, columns=None):
+    """Jalankan ekspor di thread pekerja; kembalikan ``Future`` berisi path file."""
+    return _executor.submit(export, df, fmt, columns)
+
+
+def expired(future):
+    # Ekspor selesai, tetapi filenya sudah dibersihkan oleh ``sweep``
+    return future.done() and future.exception() is None and not os.path.exists(future.result())
+
+
+def discard(future):
+    # Hapus file hasil ekspor lama (bila sudah selesai) saat permintaan diganti
+    if future is None or future.cancel():
+        return
+    if not future.done():
+        # Ekspor yang sedang berjalan tidak bisa dihentikan; filenya dihapus saat selesai
+        future.add_done_callback(discard)
+    elif future.exception() is None and os.path.exists(future.result()):
+        os.remove(future.result())
@@ -0,0 +1,25 @@
+"""Penulisan file cache/snapshot yang aman dibaca bersamaan.
+
+File ditulis ke nama sementara di direktori yang sama lalu di-rename dengan
+``os.replace`` (atomik pada sistem file yang sama), sehingga sesi, thread, atau
+proses lain tidak pernah membaca file setengah jadi.
+"""
+import os
+import threading
+
+
+def write_atomic(target, write):
+    """Panggil ``write(tmp)`` lalu pindahkan ``tmp`` ke ``target``; ``tmp`` dihapus bila gagal."""
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # pid + thread: sesi Streamlit dan pekerja latar belakang berbagi satu proses
+    tmp = f"{target}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return target
@@ -0,0 +1,69 @@
+"""Indeks filter berbasis bitmap untuk filter sidebar.
+
+Setiap nilai kolom kategori punya satu bitmap (numpy ``packbits``), sedangkan
+kolom rentang disimpan sebagai array terurut. Setiap filter diterjemahkan ke
+sebuah bitmap, lalu seluruh filter digabung dengan satu operasi AND menjadi
+array posisi baris, tanpa membuat salinan DataFrame di setiap langkah.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ("asal_univ", "jenjang", "provinsi")
+RANGE_COLUMNS = ("peminat", "daya_tampung_2025", "rasio_keketatan")
+
+
+class FilterIndex:
+    def __init__(self, df, categorical=CATEGORICAL_COLUMNS, ranges=RANGE_COLUMNS):
+        self.n = len(df)
+        self._bitmaps = {}
+        self._sorted = {}
+        # Bitmap rentang terakhir diingat, jadi menggeser satu slider
+        # hanya menghitung ulang bitmap milik slider itu
+        self.between = lru_cache(maxsize=64)(self._between)
+        for col in categorical:
+            if col in df.columns:
+                self.add_categorical(col, df[col])
+        for col in ranges:
+            if col in df.columns:
+                values = df[col].to_numpy()
+                order = np.argsort(values, kind="stable")
+                self._sorted[col] = (values[order], order)
+
+    def add_categorical(self, col, values):
+        values = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+        codes = values.cat.codes.to_numpy()
+        self._bitmaps[col] = {
+            value: self.from_mask(codes == code) for code, value in enumerate(values.cat.categories)
+        }
+
+    def from_mask(self, mask):
+        bitmap = np.packbits(mask)
+        bitmap.flags.writeable = False
+        return bitmap
+
+    def equals(self, col, value):
+        bitmap = self._bitmaps[col].get(value)
+        if bitmap is None:
+            return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+        return bitmap
+
+    def _between(self, col, low, high):
+        sorted_values, order = self._sorted[col]
+        if self.n == 0 or (low <= sorted_values[0] and high >= sorted_values[-1]):
+            # Rentang penuh tidak membatasi apa pun
+            return None
+        start = np.searchsorted(sorted_values, low, side="left")
+        stop = np.searchsorted(sorted_values, high, side="right")
+        mask = np.zeros(self.n, dtype=bool)
+        mask[order[start:stop]] = True
+        return self.from_mask(mask)
+
+    def select(self, bitmaps):
+        # Satu AND untuk semua bitmap; None berarti filter tidak aktif
+        active = [b for b in bitmaps if b is not None]
+        if not active:
+            return np.arange(self.n)
+        combined = np.bitwise_and.reduce(active) if len(active) > 1 else active[0]
+        return np.flatnonzero(np.unpackbits(combined, count=self.n))
@@ -0,0 +1,269 @@
+"""Ingest data penerimaan multi-tahun ke store lokal yang dipartisi.
+
+Contoh:
+    python ingest.py "Data/Data Jurusan Peminat Saintex.csv" --duplikat sum
+    python ingest.py data_2026.csv
+    python ingest.py update_peminat_2026.csv --tahun 2026
+
+Store berada di ``Data/store`` dengan satu file Parquet per partisi
+``tahun=<YYYY>/provinsi=<nama>``. Setiap batch di-upsert berdasarkan kunci
+(PTN, jenjang, jurusan): baris baru ditambahkan, baris lama hanya diperbarui
+pada kolom yang ada di batch (mis. update ``jumlah_peminat`` di tengah siklus).
+Kunci ganda dalam satu batch ditolak kecuali dipilih ``--duplikat last`` (baris
+terakhir dipakai) atau ``--duplikat sum`` (peminat dan daya tampung dijumlahkan).
+Hanya partisi yang tersentuh yang ditulis ulang, begitu pula agregatnya
+(jumlah peminat per provinsi dan jumlah/banyak ``rasio_keketatan`` per PTN),
+sehingga biaya ingest tidak tumbuh bersama jumlah file yang sudah masuk.
+"""
+import argparse
+import json
+import os
+import re
+from urllib.parse import quote
+
+import pandas as pd
+
+from data_loader import CATEGORY_COLUMNS, read_csv
+from fileutil import write_atomic
+
+STORE_DIR = os.path.join("Data", "store")
+MANIFEST_FILE = "manifest.json"
+UNIV_AGG_FILE = os.path.join("_aggregates", "univ_rasio.parquet")
+KEY_COLUMNS = ["asal_univ", "jenjang", "nama"]
+# Kolom wajib untuk baris yang belum pernah ada di store
+INSERT_COLUMNS = ["provinsi", "peminat", "daya_tampung"]
+# Kolom yang dijumlahkan bila kunci ganda digabung dengan --duplikat sum
+ADDITIVE_COLUMNS = ["peminat", "daya_tampung"]
+DUPLICATE_MODES = ("error", "last", "sum")
+CAPACITY_COLUMN = re.compile(r"daya_tampung_(\d{4})")
+
+
+def merge_duplicates(df, mode):
+    """Tangani kunci ganda dalam satu batch sesuai ``mode`` (lihat ``DUPLICATE_MODES``)."""
+    duplicated = df.duplicated(subset=KEY_COLUMNS, keep=False)
+    if not duplicated.any():
+        return df
+    if mode == "error":
+        keys = df.loc[duplicated, KEY_COLUMNS].drop_duplicates()
+        examples = "; ".join(" / ".join(key) for key in keys.head(3).itertuples(index=False))
+        raise ValueError(f"{len(keys)} kunci (PTN, jenjang, jurusan) muncul lebih dari sekali, mis. {examples}. "
+                         f"Gunakan --duplikat last untuk memakai baris terakhir atau --duplikat sum "
+                         f"untuk menjumlahkan peminat dan daya tampung")
+    if mode == "last":
+        return df.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+    if mode != "sum":
+        raise ValueError(f"Mode duplikat tidak dikenal: {mode!r}")
+    # Kolom lain diambil dari baris terakhir; rasio_keketatan dihitung ulang saat upsert
+    agg = {col: "last" for col in df.columns if col not in KEY_COLUMNS}
+    agg.update({col: "sum" for col in ADDITIVE_COLUMNS if col in df.columns})
+    return df.groupby(KEY_COLUMNS, sort=False, as_index=False).agg(agg)
+
+
+def read_batch(path, tahun=None, duplicates="error"):
+    """Baca satu file batch dan seragamkan skemanya untuk store."""
+    df = read_csv(path)
+    capacity = [col for col in df.columns if CAPACITY_COLUMN.fullmatch(col)]
+    if len(capacity) > 1:
+        raise ValueError(f"{path}: lebih dari satu kolom daya tampung ({', '.join(capacity)})")
+    if capacity:
+        tahun = tahun or int(CAPACITY_COLUMN.fullmatch(capacity[0]).group(1))
+        df = df.rename(columns={capacity[0]: "daya_tampung"})
+    if tahun is None:
+        raise ValueError(f"{path}: tahun tidak diketahui, gunakan --tahun")
+    missing = [col for col in KEY_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"{path}: kolom kunci tidak ditemukan: {', '.join(missing)}")
+    # Kunci dibersihkan dari spasi berlebih agar "Kimia " dan "Kimia" dianggap sama
+    for col in KEY_COLUMNS + ["provinsi"]:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+    merged = int(df.duplicated(subset=KEY_COLUMNS).sum())
+    try:
+        df = merge_duplicates(df, duplicates)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+    df.attrs["duplicates_merged"] = merged
+    df["tahun"] = int(tahun)
+    return df
+
+
+class Store:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.manifest = self._read_manifest()
+
+    # ======================= MANIFEST & FILE ========================
+    def _read_manifest(self):
+        path = os.path.join(self.root, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {"version": 0, "partitions": {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        def write(tmp):
+            with open(tmp, "w") as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+        write_atomic(os.path.join(self.root, MANIFEST_FILE), write)
+
+    @property
+    def version(self):
+        return f"store-v{self.manifest['version']}"
+
+    def exists(self):
+        return bool(self.manifest["partitions"])
+
+    def years(self):
+        return sorted({p["tahun"] for p in self.manifest["partitions"].values()})
+
+    def partition_key(self, tahun, provinsi):
+        return f"tahun={int(tahun)}/provinsi={quote(provinsi, safe='')}"
+
+    def _write_parquet(self, df, relpath):
+        write_atomic(os.path.join(self.root, relpath), lambda tmp: df.to_parquet(tmp, index=False))
+
+    def _read_partition(self, key):
+        path = os.path.join(self.root, key, "data.parquet")
+        return pd.read_parquet(path) if os.path.exists(path) else None
+
+    def _univ_aggregates(self):
+        path = os.path.join(self.root, UNIV_AGG_FILE)
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        return pd.DataFrame(columns=["partition", "tahun", "provinsi", "asal_univ", "rasio_sum", "rasio_count"])
+
+    # ======================= INGEST ========================
+    def _resolve_provinsi(self, batch):
+        # Batch update boleh tanpa kolom provinsi; provinsi diambil dari PTN yang sudah dikenal
+        if "provinsi" not in batch.columns:
+            batch["provinsi"] = pd.NA
+        unknown = batch["provinsi"].isna() | (batch["provinsi"] == "nan")
+        if unknown.any():
+            known = self._univ_aggregates().drop_duplicates("asal_univ").set_index("asal_univ")["provinsi"]
+            batch.loc[unknown, "provinsi"] = batch.loc[unknown, "asal_univ"].map(known)
+            unresolved = batch["provinsi"].isna()
+            if unresolved.any():
+                names = ", ".join(sorted(batch.loc[unresolved, "asal_univ"].unique())[:5])
+                raise ValueError(f"Provinsi tidak diketahui untuk PTN: {names}")
+        return batch
+
+    def _upsert(self, existing, batch):
+        batch = batch.set_index(KEY_COLUMNS)
+        if existing is None:
+            existing = batch.iloc[0:0]
+        else:
+            existing = existing.set_index(KEY_COLUMNS)
+        dtypes = existing.dtypes
+        is_update = batch.index.isin(existing.index)
+        updates, inserts = batch[is_update], batch[~is_update]
+        missing = [col for col in INSERT_COLUMNS if col not in inserts.columns or inserts[col].isna().any()]
+        if len(inserts) and missing:
+            raise ValueError(f"Baris baru membutuhkan kolom: {', '.join(missing)}")
+        if len(updates):
+            # Hanya kolom yang ada (dan terisi) di batch yang ditimpa
+            existing.update(updates[[col for col in updates.columns if col in existing.columns]])
+        merged = pd.concat([existing, inserts]) if len(existing) and len(inserts) else (
+            existing if len(existing) else inserts.copy())
+        touched = merged.index.isin(batch.index)
+        # Rasio keketatan pada data sumber = daya tampung / peminat
+        merged.loc[touched, "rasio_keketatan"] = (
+            merged.loc[touched, "daya_tampung"] / merged.loc[touched, "peminat"]
+        )
+        if "rata-rata_rasio" in merged.columns and "sepi_peminatan" in merged.columns:
+            # rata-rata_rasio adalah ambang tetap dari data sumber (bukan rata-rata baris di store),
+            # jadi hanya sepi_peminatan yang ikut dihitung ulang: di data sumber sepi = rasio <= ambang
+            threshold = merged.loc[touched, "rata-rata_rasio"]
+            merged.loc[touched, "sepi_peminatan"] = (
+                (merged.loc[touched, "rasio_keketatan"] <= threshold).where(threshold.notna())
+            )
+        # DataFrame.update/concat bisa mengubah bilangan bulat/boolean menjadi float
+        for col, dtype in dtypes.items():
+            if merged[col].dtype != dtype and merged[col].notna().all():
+                merged[col] = merged[col].astype(dtype)
+        return merged.reset_index(), int(is_update.sum()), len(inserts)
+
+    def ingest(self, batch):
+        """Upsert satu batch; kembalikan ringkasan partisi yang berubah."""
+        batch = self._resolve_provinsi(batch.copy())
+        for col in CATEGORY_COLUMNS:
+            if col in batch.columns:
+                batch[col] = batch[col].astype(str)
+        univ_agg = self._univ_aggregates()
+        summary = {"inserted": 0, "updated": 0, "partitions": []}
+        for (tahun, provinsi), part in batch.groupby(["tahun", "provinsi"], sort=False):
+            key = self.partition_key(tahun, provinsi)
+            existing = self._read_partition(key)
+            merged, updated, inserted = self._upsert(existing, part)
+            self._write_parquet(merged, os.path.join(key, "data.parquet"))
+            # Agregat hanya dihitung ulang untuk partisi ini
+            self.manifest["partitions"][key] = {
+                "tahun": int(tahun),
+                "provinsi": provinsi,
+                "rows": len(merged),
+                "peminat_sum": int(merged["peminat"].sum()),
+            }
+            rasio = merged.groupby("asal_univ")["rasio_keketatan"].agg(rasio_sum="sum", rasio_count="count")
+            rasio = rasio.reset_index().assign(partition=key, tahun=int(tahun), provinsi=provinsi)
+            univ_agg = univ_agg[univ_agg["partition"] != key]
+            univ_agg = pd.concat([univ_agg, rasio], ignore_index=True) if len(univ_agg) else rasio
+            summary["updated"] += updated
+            summary["inserted"] += inserted
+            summary["partitions"].append(key)
+        if summary["partitions"]:
+            self._write_parquet(univ_agg, UNIV_AGG_FILE)
+            self.manifest["version"] += 1
+            self._write_manifest()
+        return summary
+
+    # ======================= BACA & AGREGAT ========================
+    def _partitions(self, tahun=None):
+        return {k: p for k, p in self.manifest["partitions"].items() if tahun is None or p["tahun"] == tahun}
+
+    def load(self, tahun=None):
+        """Baca hanya partisi tahun yang diminta, dengan tipe kolom seperti data_loader."""
+        parts = [self._read_partition(key) for key in sorted(self._partitions(tahun))]
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts, ignore_index=True)
+        return df.astype({col: "category" for col in CATEGORY_COLUMNS if col in df.columns})
+
+    def province_peminat(self, tahun=None):
+        # Jumlah peminat per provinsi langsung dari manifest, tanpa membaca partisi
+        parts = pd.DataFrame(self._partitions(tahun).values(), columns=["provinsi", "peminat_sum"])
+        return parts.groupby("provinsi")["peminat_sum"].sum().rename("peminat")
+
+    def university_rasio_mean(self, tahun=None):
+        agg = self._univ_aggregates()
+        if tahun is not None:
+            agg = agg[agg["tahun"] == tahun]
+        totals = agg.groupby("asal_univ")[["rasio_sum", "rasio_count"]].sum()
+        return (totals["rasio_sum"] / totals["rasio_count"]).rename("rasio_keketatan").sort_values(ascending=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest file data jurusan ke store multi-tahun.")
+    parser.add_argument("files", nargs="+", help="File CSV batch (tahunan atau update)")
+    parser.add_argument("--tahun", type=int, help="Tahun data bila tidak ada kolom daya_tampung_(tahun_YYYY)")
+    parser.add_argument("--store", default=STORE_DIR, help="Direktori store (bawaan: Data/store)")
+    parser.add_argument("--duplikat", choices=DUPLICATE_MODES, default="error",
+                        help="Kunci ganda dalam satu file: error (bawaan), last = baris terakhir dipakai, "
+                             "sum = peminat dan daya tampung dijumlahkan")
+    args = parser.parse_args(argv)
+
+    store = Store(args.store)
+    for path in args.files:
+        try:
+            batch = read_batch(path, args.tahun, args.duplikat)
+        except ValueError as e:
+            parser.error(str(e))
+        if batch.attrs["duplicates_merged"]:
+            how = "baris terakhir dipakai" if args.duplikat == "last" else "peminat dan daya tampung dijumlahkan"
+            print(f"{path}: {batch.attrs['duplicates_merged']} baris dengan kunci ganda, {how}")
+        summary = store.ingest(batch)
+        print(f"{path}: {summary['inserted']} baris baru, {summary['updated']} diperbarui, "
+              f"{len(summary['partitions'])} partisi ditulis ulang")
+    print(f"Store {store.root} kini {store.version}, tahun: {', '.join(map(str, store.years()))}")
+
+
+if __name__ == "__main__":
+    main()
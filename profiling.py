@@ -0,0 +1,128 @@
+"""Mode profiling bawaan dashboard.
+
+Aktif bila variabel lingkungan ``DASHBOARD_PROFILE=1`` atau parameter URL
+``?profile=1``. Setiap bagian bernomor di ``app.py`` menjadi satu batas
+pengukuran: waktu total, waktu operasi pandas (agregasi/filter), waktu render
+grafik, dan selisih RSS proses. Hasilnya ditampilkan di panel debug dan
+dikirim sebagai JSON lines lewat logger ``dashboard.profile`` (ke stderr, atau
+ke file bila ``DASHBOARD_PROFILE_LOG`` diisi).
+"""
+import contextvars
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # psutil opsional; RSS tidak dicatat bila tidak tersedia
+    psutil = None
+
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_LOG_ENV = "DASHBOARD_PROFILE_LOG"
+TIMER_KINDS = ("pandas", "render")
+
+logger = logging.getLogger("dashboard.profile")
+_current = contextvars.ContextVar("dashboard_profiler", default=None)
+
+
+def _setup_logger():
+    if logger.handlers:
+        return
+    path = os.environ.get(PROFILE_LOG_ENV)
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _rss_mb():
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def is_enabled(query_params=None):
+    if os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes"):
+        return True
+    return query_params is not None and query_params.get("profile") in ("1", "true")
+
+
+class Profiler:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+        self._section = None
+        self._run_start = time.perf_counter()
+        self._run_rss = _rss_mb() if enabled else None
+
+    def start_section(self, name):
+        # Bagian sebelumnya otomatis ditutup saat bagian berikutnya dimulai
+        if not self.enabled:
+            return
+        self.end_section()
+        self._section = {
+            "section": name,
+            "start": time.perf_counter(),
+            "rss_start": _rss_mb(),
+            **{f"{kind}_ms": 0.0 for kind in TIMER_KINDS},
+        }
+
+    def end_section(self):
+        if not self.enabled or self._section is None:
+            return
+        record = self._section
+        self._section = None
+        rss_start = record.pop("rss_start")
+        rss_end = _rss_mb()
+        record["wall_ms"] = (time.perf_counter() - record.pop("start")) * 1000
+        record["rss_mb"] = rss_end
+        record["rss_delta_mb"] = None if rss_end is None else rss_end - rss_start
+        self.records.append(record)
+
+    def add_time(self, kind, seconds):
+        if self._section is not None:
+            self._section[f"{kind}_ms"] += seconds * 1000
+
+    def finish(self):
+        """Tutup bagian terakhir, catat ringkasan rerun, lalu kirim semua record ke log."""
+        if not self.enabled:
+            return []
+        self.end_section()
+        rss_end = _rss_mb()
+        summary = {
+            "section": "__rerun__",
+            "wall_ms": (time.perf_counter() - self._run_start) * 1000,
+            "rss_mb": rss_end,
+            "rss_delta_mb": None if rss_end is None else rss_end - self._run_rss,
+            **{f"{kind}_ms": sum(r[f"{kind}_ms"] for r in self.records) for kind in TIMER_KINDS},
+        }
+        self.records.append(summary)
+        _setup_logger()
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        for record in self.records:
+            logger.info(json.dumps({"run_id": self.run_id, "timestamp": timestamp, **record}))
+        return self.records
+
+
+def activate(profiler):
+    _current.set(profiler)
+    return profiler
+
+
+@contextmanager
+def timed(kind):
+    # Menambahkan durasi blok ke bagian yang sedang aktif (bila profiling aktif)
+    profiler = _current.get()
+    if profiler is None or not profiler.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_time(kind, time.perf_counter() - start)
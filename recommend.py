@@ -0,0 +1,76 @@
+"""Mesin rekomendasi jurusan berbobot.
+
+Setiap kriteria dinormalisasi sekali ke rentang 0..1 atas seluruh data, jadi
+skor untuk satu vektor bobot cukup satu perkalian matriks-vektor. Top-k dipilih
+dengan ``argpartition`` (tanpa sort penuh), dan skor diingat per vektor bobot
+sehingga mengganti filter tidak menghitung ulang skor.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from data_loader import SALARY_COLUMN
+
+# Nama kriteria -> fungsi nilai mentah (makin besar makin direkomendasikan)
+CRITERIA = {
+    "Sepi Peminat": lambda df: -np.log1p(df["peminat"].to_numpy(dtype="float64")),
+    "Daya Tampung": lambda df: np.log1p(df["daya_tampung_2025"].to_numpy(dtype="float64")),
+    # rasio_keketatan = daya tampung / peminat, jadi makin besar makin mudah masuk
+    "Peluang Masuk": lambda df: np.log1p(df["rasio_keketatan"].to_numpy(dtype="float64")),
+    "Gaji Lulusan": lambda df: df[SALARY_COLUMN].astype("float64").to_numpy(),
+    "Prospek Kerja": lambda df: (df["kualitas_prospek_kerja"].astype(str) == "BAGUS").to_numpy(dtype="float64"),
+}
+CRITERIA_COLUMNS = {
+    "Sepi Peminat": "peminat",
+    "Daya Tampung": "daya_tampung_2025",
+    "Peluang Masuk": "rasio_keketatan",
+    "Gaji Lulusan": SALARY_COLUMN,
+    "Prospek Kerja": "kualitas_prospek_kerja",
+}
+DEFAULT_WEIGHTS = {
+    "Sepi Peminat": 3,
+    "Daya Tampung": 1,
+    "Peluang Masuk": 3,
+    "Gaji Lulusan": 1,
+    "Prospek Kerja": 2,
+}
+
+
+class RecommendationEngine:
+    def __init__(self, df, criteria=CRITERIA):
+        # Kriteria yang kolomnya tidak ada di data diabaikan
+        self.criteria = [name for name in criteria if CRITERIA_COLUMNS[name] in df.columns]
+        columns = []
+        for name in self.criteria:
+            values = criteria[name](df)
+            # Nilai kosong (mis. gaji tidak tercatat) diberi nilai terburuk
+            values = np.nan_to_num(values, nan=np.nanmin(values) if np.isfinite(values).any() else 0.0)
+            span = values.max() - values.min()
+            columns.append((values - values.min()) / span if span else np.zeros_like(values))
+        self.matrix = np.column_stack(columns) if columns else np.zeros((len(df), 0))
+        self.matrix.flags.writeable = False
+        self.scores = lru_cache(maxsize=32)(self._scores)
+
+    def _scores(self, weights):
+        # weights: tuple berurutan sesuai self.criteria; dinormalisasi agar skor tetap 0..1
+        weights = np.asarray(weights, dtype="float64")
+        total = weights.sum()
+        scores = self.matrix @ (weights / total if total else weights)
+        scores.flags.writeable = False
+        return scores
+
+    def weight_vector(self, weights):
+        return tuple(float(weights.get(name, 0)) for name in self.criteria)
+
+    def top_k(self, weights, k=10, rows=None):
+        """Posisi baris dan skor ``k`` rekomendasi teratas, opsional dibatasi ke ``rows``."""
+        scores = self.scores(self.weight_vector(weights))
+        positions = np.arange(len(scores)) if rows is None else np.asarray(rows)
+        candidates = scores[positions]
+        k = min(k, len(candidates))
+        if k == 0:
+            return positions[:0], candidates[:0]
+        best = np.argpartition(-candidates, k - 1)[:k]
+        # Hanya k kandidat terpilih yang diurutkan
+        best = best[np.argsort(-candidates[best], kind="stable")]
+        return positions[best], candidates[best]
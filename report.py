@@ -0,0 +1,277 @@
+"""Laporan statis (HTML/PDF) dari bagian-bagian dashboard untuk satu preset filter.
+
+Contoh:
+    python report.py                              # satu laporan untuk seluruh data
+    python report.py --provinsi Bali --provinsi "Jawa Barat"
+    python report.py --semua-provinsi --format html,pdf
+
+Setiap laporan memuat ringkasan data, 14 grafik bernomor seperti di ``app.py``
+dan tabel rekomendasi. Grafik dirender paralel di process pool (satu proses per
+core). Hasil render disimpan di ``reports/.cache`` dengan nama berisi hash isi
+data masukannya, jadi bagian yang datanya tidak berubah (mis. grafik nasional
+yang sama di semua laporan provinsi) tidak dirender ulang.
+"""
+import argparse
+import base64
+import hashlib
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.image as mpimg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from aggregates import AGGREGATES
+from charts import PLOTLY_RENDERERS, RENDERERS, data_hash, figure_to_png
+from data_loader import DATA_PATH, load_dataset
+from fileutil import write_atomic
+from recommend import DEFAULT_WEIGHTS, RecommendationEngine
+import sections
+
+REPORT_DIR = "reports"
+CACHE_DIR = os.path.join(REPORT_DIR, ".cache")
+# Naikkan bila tampilan grafik berubah agar cache render lama tidak dipakai
+RENDER_VERSION = "1"
+FORMATS = ("html", "pdf")
+RECOMMENDATION_COLUMNS = ['nama', 'asal_univ', 'jenjang', 'peminat', 'daya_tampung_2025', 'rasio_keketatan']
+
+
+# ======================= BAGIAN LAPORAN ========================
+def build_sections(df, filtered_df):
+    """Daftar (judul, nama renderer, data) dengan masukan yang sama seperti di app.py."""
+    nama_sums = AGGREGATES["nama_sums"](filtered_df)
+    avg_rasio_univ = AGGREGATES["univ_rasio_mean"](df).head(15)
+    top_8, bottom_8 = sections.dual_bar(nama_sums)
+    return [
+        ("1. Top 10 Jurusan dengan Peminat Terendah", "peminat_terendah", sections.peminat_terendah(nama_sums)),
+        ("2. Top 10 Jurusan dengan Daya Tampung Tertinggi", "daya_tampung", sections.daya_tampung(nama_sums)),
+        ("3. Distribusi Jenjang Pendidikan", "jenjang_pie", sections.jenjang_count(filtered_df)),
+        ("4a. Top 8 Jurusan: Peminat vs Daya Tampung", "dual_bar", top_8),
+        ("4b. Bottom 8 Jurusan: Peminat vs Daya Tampung", "dual_bar", bottom_8),
+        ("5. Top 10 Jurusan dengan Rata-rata Gaji Tertinggi", "gaji_tertinggi", sections.gaji_tertinggi(filtered_df)),
+        ("5a. Jurusan dengan Rata-Rata Gaji Lulusan Tertinggi", "gaji_rata_rata", sections.gaji_rata_rata(filtered_df)),
+        ("5b. Distribusi Gaji Lulusan Berdasarkan Jenjang", "gaji_boxplot", sections.gaji_jenjang(filtered_df)),
+        ("6. Heatmap Peminat per Provinsi", "heatmap_provinsi",
+         AGGREGATES["provinsi_peminat"](filtered_df).reset_index()),
+        ("8. Top 20 Jurusan dengan Rasio Keketatan Tertinggi", "rasio_tertinggi", sections.rasio_tertinggi(df)),
+        ("9. Rata-rata Rasio Keketatan per Universitas (Top 15)", "rasio_univ", avg_rasio_univ),
+        ("10. Bubble Chart: Peminat vs Daya Tampung", "bubble", sections.bubble(df)),
+        ("11. Lollipop Chart: Rata-rata Rasio Keketatan per Universitas (Top 15)", "lollipop_univ", avg_rasio_univ),
+        ("12. Jumlah Peminat Per Universitas dan Jurusan", "treemap", sections.treemap(df)),
+        ("13. Hirarki Universitas, Jenjang, dan Jurusan di Bali", "sunburst", sections.sunburst(df)),
+        ("14. Histogram Distribusi Peminat", "histogram_peminat", df['peminat']),
+    ]
+
+
+def summary_metrics(filtered_df):
+    return {
+        "Jumlah Jurusan Unik": filtered_df['nama'].nunique(),
+        "Jumlah PTN": filtered_df['asal_univ'].nunique(),
+        "Total Daya Tampung": int(filtered_df['daya_tampung_2025'].sum()),
+    }
+
+
+def recommendations(df, filtered_df, engine, k=10):
+    rows, scores = engine.top_k(DEFAULT_WEIGHTS, k, df.index.get_indexer(filtered_df.index))
+    return df.iloc[rows][RECOMMENDATION_COLUMNS].assign(skor=scores.round(3))
+
+
+# ======================= RENDER PARALEL ========================
+def section_hash(name, data):
+    return hashlib.sha1(f"{RENDER_VERSION}-{name}-{data_hash(data)}".encode()).hexdigest()[:20]
+
+
+def cache_file(name, digest, cache_dir=CACHE_DIR):
+    ext = "html" if name in PLOTLY_RENDERERS else "png"
+    return os.path.join(cache_dir, f"{name}-{digest}.{ext}")
+
+
+def render_section(name, data, target):
+    """Dijalankan di proses pekerja: render satu grafik dan tulis hasilnya ke ``target``."""
+    if name in PLOTLY_RENDERERS:
+        content = PLOTLY_RENDERERS[name](data).to_html(full_html=False, include_plotlyjs=False).encode()
+    else:
+        content = figure_to_png(RENDERERS[name](data))
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            f.write(content)
+    return write_atomic(target, write)
+
+
+def render_all(reports, executor, cache_dir=CACHE_DIR):
+    """Render semua bagian unik dari seluruh laporan; kembalikan (dirender, dilewati)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    pending = {}
+    cached = set()
+    for report in reports:
+        for section in report["sections"]:
+            target = section["file"]
+            if target is None or target in pending or target in cached:
+                continue
+            if os.path.exists(target):
+                cached.add(target)
+                continue
+            # Grafik dengan data identik (mis. grafik nasional) hanya dirender sekali
+            pending[target] = executor.submit(render_section, section["name"], section["data"], target)
+    for future in pending.values():
+        future.result()
+    return len(pending), len(cached)
+
+
+# ======================= KELUARAN ========================
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "laporan"
+
+
+def _table_html(df):
+    return df.to_html(index=False, border=0, classes="tabel", float_format=lambda v: f"{v:,.3f}")
+
+
+def write_html(report, path, plotly_js="inline"):
+    parts = [f"<h1>{html.escape(report['title'])}</h1>",
+             f"<p class='meta'>Dibuat {report['created']} dari {len(report['filtered']):,} baris data.</p>",
+             "<h2>Ringkasan Data</h2><div class='metrik'>"]
+    parts += [f"<div><span>{html.escape(label)}</span><b>{value:,}</b></div>"
+              for label, value in report["metrics"].items()]
+    parts.append("</div><h2>Visualisasi Data</h2>")
+    for section in report["sections"]:
+        parts.append(f"<h3>{html.escape(section['title'])}</h3>")
+        if section["file"] is None:
+            parts.append("<p><i>Tidak ada data untuk preset ini.</i></p>")
+        elif section["file"].endswith(".png"):
+            with open(section["file"], "rb") as f:
+                encoded = base64.b64encode(f.read()).decode()
+            parts.append(f"<img src='data:image/png;base64,{encoded}' alt='{html.escape(section['title'])}'>")
+        else:
+            with open(section["file"], encoding="utf-8") as f:
+                parts.append(f.read())
+    parts.append("<h2>Rekomendasi Sistem</h2>")
+    parts.append(_table_html(report["recommendations"]))
+    if plotly_js == "inline":
+        from plotly.offline import get_plotlyjs
+        script = f"<script>{get_plotlyjs()}</script>"
+    else:
+        script = '<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>'
+    document = f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>{html.escape(report['title'])}</title>{script}
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: auto; padding: 1em; color: #222; }}
+img {{ max-width: 100%; }}
+.meta {{ color: #666; }}
+.metrik {{ display: flex; gap: 2em; }}
+.metrik span {{ display: block; color: #666; }}
+.metrik b {{ font-size: 1.8em; }}
+.tabel {{ border-collapse: collapse; }}
+.tabel td, .tabel th {{ padding: 4px 8px; border-bottom: 1px solid #ddd; }}
+</style></head><body>
+{''.join(parts)}
+</body></html>"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document)
+
+
+def write_pdf(report, path):
+    # Tanpa browser headless: hanya grafik PNG yang masuk PDF, grafik interaktif dilewati
+    with PdfPages(path) as pdf:
+        fig = Figure(figsize=(8.27, 11.69))
+        fig.text(0.08, 0.92, report["title"], fontsize=16, weight="bold")
+        fig.text(0.08, 0.89, f"Dibuat {report['created']} dari {len(report['filtered']):,} baris data.", fontsize=9)
+        for i, (label, value) in enumerate(report["metrics"].items()):
+            fig.text(0.08, 0.84 - i * 0.03, f"{label}: {value:,}", fontsize=11)
+        ax = fig.add_axes([0.05, 0.05, 0.9, 0.6])
+        ax.axis("off")
+        ax.set_title("Rekomendasi Sistem", loc="left")
+        table = report["recommendations"].astype({"nama": str, "asal_univ": str, "jenjang": str})
+        ax.table(cellText=table.astype(str).to_numpy(), colLabels=table.columns, loc="upper left", fontsize=6)
+        pdf.savefig(fig)
+        for section in report["sections"]:
+            if section["file"] is None or not section["file"].endswith(".png"):
+                continue
+            fig = Figure(figsize=(11.69, 8.27))
+            ax = fig.add_axes([0.02, 0.02, 0.96, 0.9])
+            ax.imshow(mpimg.imread(section["file"]))
+            ax.axis("off")
+            fig.suptitle(section["title"])
+            pdf.savefig(fig)
+
+
+# ======================= PRESET ========================
+def build_report(df, title, filtered_df, engine, cache_dir=CACHE_DIR):
+    sections = []
+    for section_title, name, data in build_sections(df, filtered_df):
+        parts = data if isinstance(data, tuple) else (data,)
+        is_empty = any(getattr(p, "empty", False) for p in parts)
+        sections.append({
+            "title": section_title,
+            "name": name,
+            "data": data,
+            "file": None if is_empty else cache_file(name, section_hash(name, data), cache_dir),
+        })
+    return {
+        "title": title,
+        "created": time.strftime("%Y-%m-%d %H:%M"),
+        "filtered": filtered_df,
+        "metrics": summary_metrics(filtered_df),
+        "sections": sections,
+        "recommendations": recommendations(df, filtered_df, engine),
+    }
+
+
+def presets(df, provinsi=None, semua_provinsi=False):
+    """(judul, DataFrame hasil filter) untuk setiap laporan yang diminta."""
+    names = sorted(df['provinsi'].astype(str).unique()) if semua_provinsi else (provinsi or [])
+    if not names:
+        return [("Laporan Analisis Jurusan - Seluruh Data", df)]
+    selected = []
+    for name in names:
+        filtered_df = df[df['provinsi'].astype(str).str.lower() == name.lower()]
+        if filtered_df.empty:
+            raise SystemExit(f"Provinsi tidak ditemukan: {name}")
+        selected.append((f"Laporan Analisis Jurusan - Provinsi {name}", filtered_df))
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buat laporan statis dashboard per preset filter.")
+    parser.add_argument("--data", default=DATA_PATH, help="File CSV data jurusan")
+    parser.add_argument("--provinsi", action="append", help="Buat laporan untuk provinsi ini (boleh berulang)")
+    parser.add_argument("--semua-provinsi", action="store_true", help="Satu laporan untuk setiap provinsi")
+    parser.add_argument("--format", default="html", help="html, pdf, atau html,pdf")
+    parser.add_argument("--output", default=REPORT_DIR, help="Direktori laporan (bawaan: reports)")
+    parser.add_argument("--plotly-js", choices=["inline", "cdn"], default="inline",
+                        help="inline = bisa dibuka tanpa internet (bawaan), cdn = file lebih kecil")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah proses render")
+    args = parser.parse_args(argv)
+
+    formats = {fmt.strip().lower() for fmt in args.format.split(",")}
+    unknown = sorted(formats - set(FORMATS))
+    if unknown:
+        parser.error(f"--format tidak dikenal: {', '.join(unknown) or args.format!r} "
+                     f"(pilihan: {', '.join(FORMATS)})")
+    df = load_dataset(args.data)
+    engine = RecommendationEngine(df)
+    cache_dir = os.path.join(args.output, ".cache")
+    reports = [build_report(df, title, filtered_df, engine, cache_dir)
+               for title, filtered_df in presets(df, args.provinsi, args.semua_provinsi)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        rendered, skipped = render_all(reports, executor, cache_dir)
+    print(f"{rendered} grafik dirender, {skipped} tidak berubah (dari cache) "
+          f"dalam {time.perf_counter() - start:.1f} s")
+
+    for report in reports:
+        stem = os.path.join(args.output, slugify(report["title"].split(" - ", 1)[-1]))
+        if "html" in formats:
+            write_html(report, f"{stem}.html", args.plotly_js)
+            print(f"  {stem}.html")
+        if "pdf" in formats:
+            write_pdf(report, f"{stem}.pdf")
+            print(f"  {stem}.pdf")
+
+
+if __name__ == "__main__":
+    main()
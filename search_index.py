@@ -0,0 +1,154 @@
+"""Indeks pencarian jurusan untuk kotak "Cari Jurusan".
+
+Indeks dibangun sekali dari nilai unik (bukan per baris): teks dinormalisasi
+(huruf kecil, tanpa aksen dan tanda baca), dipecah menjadi token, lalu setiap
+token dicatat di indeks trigram. Pencarian mendukung kecocokan persis, awalan
+("tek" -> "teknik") dan fuzzy untuk salah ketik (hanya bila tidak ada
+kecocokan persis/awalan), diurutkan berdasarkan skor,
+kemudian dipetakan kembali ke posisi baris lewat kode kategori.
+"""
+import bisect
+import difflib
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ("nama",)
+EXTENDED_FIELDS = ("nama", "asal_univ", "prospek_kerja")
+
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.9
+FUZZY_WEIGHT = 0.8
+COMPACT_SCORE = 0.7
+
+
+def normalize_text(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^0-9a-z]+", " ", text.lower()).strip()
+
+
+def tokenize(text):
+    return normalize_text(text).split()
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, df, fields=EXTENDED_FIELDS, fuzzy_threshold=0.75):
+        self.n = len(df)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fields = [col for col in fields if col in df.columns]
+        # Dokumen = satu nilai unik dari satu kolom
+        self._docs = []
+        self._doc_codes = {}
+        self._row_codes = {}
+        postings = defaultdict(set)
+        for col in self.fields:
+            codes, uniques = pd.factorize(df[col].astype("string"), sort=False)
+            self._row_codes[col] = codes
+            self._doc_codes[col] = []
+            for code, value in enumerate(uniques):
+                doc_id = len(self._docs)
+                tokens = tokenize(value)
+                self._docs.append((col, code, str(value), "".join(tokens)))
+                self._doc_codes[col].append(doc_id)
+                for token in tokens:
+                    postings[token].add(doc_id)
+        self._postings = dict(postings)
+        self._vocab = sorted(self._postings)
+        grams = defaultdict(set)
+        for token in self._vocab:
+            for gram in trigrams(token):
+                grams[gram].add(token)
+        self._trigrams = dict(grams)
+        self._ranked = lru_cache(maxsize=256)(self._rank)
+        self.mask = lru_cache(maxsize=64)(self._mask)
+
+    def _token_matches(self, query_token):
+        # token kosakata -> skor terbaik untuk satu token query
+        matches = {}
+        if query_token in self._postings:
+            matches[query_token] = EXACT_SCORE
+        start = bisect.bisect_left(self._vocab, query_token)
+        for token in self._vocab[start:]:
+            if not token.startswith(query_token):
+                break
+            matches.setdefault(token, PREFIX_SCORE)
+        # Fuzzy hanya sebagai cadangan salah ketik: bila token sudah cocok persis/awalan,
+        # kemiripan ejaan ("biologi" ~ "sosiologi") tidak boleh memperluas hasil filter
+        if not matches and len(query_token) >= 3:
+            # Kandidat fuzzy = token yang berbagi trigram, lalu dinilai dengan rasio kemiripan
+            candidates = set()
+            for gram in trigrams(query_token):
+                candidates.update(self._trigrams.get(gram, ()))
+            for token in candidates:
+                if abs(len(token) - len(query_token)) > 3:
+                    continue
+                similarity = difflib.SequenceMatcher(None, query_token, token).ratio()
+                if similarity >= self.fuzzy_threshold:
+                    matches[token] = FUZZY_WEIGHT * similarity
+            # Hanya tingkat kemiripan tertinggi ("pertnian" -> "pertanian", bukan juga "perairan")
+            if matches:
+                best = max(matches.values())
+                matches = {token: score for token, score in matches.items() if score == best}
+        return matches
+
+    def _rank(self, query, fields):
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        allowed = {doc_id for col in fields if col in self._doc_codes for doc_id in self._doc_codes[col]}
+        scores = None
+        for query_token in query_tokens:
+            token_scores = {}
+            for token, score in self._token_matches(query_token).items():
+                for doc_id in self._postings[token]:
+                    if doc_id in allowed and score > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                # Semua token query harus cocok (AND)
+                scores = {d: scores[d] + s for d, s in token_scores.items() if d in scores}
+        scores = {d: s / len(query_tokens) for d, s in scores.items()}
+        # Variasi spasi ("teknikelektro") dicek pada teks yang dipadatkan
+        compact = "".join(query_tokens)
+        for doc_id in allowed:
+            if doc_id not in scores and compact in self._docs[doc_id][3]:
+                scores[doc_id] = COMPACT_SCORE
+        return sorted(scores.items(), key=lambda item: (-item[1], len(self._docs[item[0]][2]), self._docs[item[0]][2]))
+
+    def search(self, query, fields=SEARCH_FIELDS, limit=None):
+        """Kembalikan daftar ``(kolom, nilai, skor)`` yang diurutkan dari skor tertinggi."""
+        results = []
+        seen = set()
+        for doc_id, score in self._ranked(query, tuple(fields)):
+            col, _, value, compact = self._docs[doc_id]
+            # Nilai yang hanya beda spasi/kapital ditampilkan sekali
+            if (col, compact) in seen:
+                continue
+            seen.add((col, compact))
+            results.append((col, value.strip(), round(score, 3)))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def _mask(self, query, fields=SEARCH_FIELDS):
+        # Peta hasil pencarian kembali ke baris: boolean per baris
+        mask = np.zeros(self.n, dtype=bool)
+        matched = defaultdict(list)
+        for doc_id, _ in self._ranked(query, tuple(fields)):
+            col, code = self._docs[doc_id][:2]
+            matched[col].append(code)
+        for col, codes in matched.items():
+            mask |= np.isin(self._row_codes[col], codes)
+        mask.flags.writeable = False
+        return mask
@@ -0,0 +1,75 @@
+"""Masukan grafik untuk setiap bagian bernomor dashboard.
+
+Dipakai bersama oleh ``app.py`` dan ``report.py`` agar dashboard dan laporan
+statis selalu menggambar data yang sama. Setiap fungsi menerima DataFrame
+(atau agregat dari ``aggregates.py``) dan mengembalikan data yang langsung
+diberikan ke renderer di ``charts.py``; kolom kategori diubah ke string karena
+seaborn dan plotly tidak menangani kategori kosong atau path hirarki kategori.
+"""
+SALARY = "rata-rata_gaji_lulusan"
+DUAL_BAR_TITLES = ("Top 8 Jurusan: Peminat vs Daya Tampung", "Bottom 8 Jurusan: Peminat vs Daya Tampung")
+
+
+# ======================= DATA HASIL FILTER ========================
+def peminat_terendah(nama_sums):
+    return nama_sums['peminat'].sort_values(ascending=True).head(10)
+
+
+def daya_tampung(nama_sums):
+    return nama_sums['daya_tampung_2025'].sort_values(ascending=False).head(10)
+
+
+def jenjang_count(df):
+    counts = df['jenjang'].value_counts()
+    return counts[counts > 0]
+
+
+def dual_bar(nama_sums):
+    """Dua masukan grafik 4: (top 8, judul) dan (bottom 8, judul) berdasarkan peminat."""
+    top_8 = nama_sums.sort_values(by='peminat', ascending=False).head(8)
+    bottom_8 = nama_sums.sort_values(by='peminat', ascending=True).head(8)
+    return (top_8, DUAL_BAR_TITLES[0]), (bottom_8, DUAL_BAR_TITLES[1])
+
+
+def gaji_tertinggi(df):
+    # Satu baris (gaji tertinggi) per jurusan, lalu 10 jurusan teratas
+    data_filtered = df.loc[df.groupby('nama', observed=True)[SALARY].idxmax()]
+    return (data_filtered[['nama', SALARY]]
+            .rename(columns={SALARY: 'gaji_bersih'})
+            .astype({'nama': str})
+            .sort_values(by='gaji_bersih', ascending=False).head(10))
+
+
+def gaji_rata_rata(df):
+    return df.nlargest(10, SALARY).astype({'nama': str})[['nama', SALARY]]
+
+
+def gaji_jenjang(df):
+    return df[['jenjang', SALARY]]
+
+
+# ======================= SELURUH DATA ========================
+def rasio_tertinggi(df):
+    return df.sort_values(by="rasio_keketatan", ascending=False).head(20).astype({'nama': str})[['nama', 'rasio_keketatan']]
+
+
+def bubble(df):
+    return df[["nama", "peminat", "daya_tampung_2025", "rasio_keketatan", "jenjang"]].astype({'nama': str, 'jenjang': str})
+
+
+def treemap(df):
+    return df[['asal_univ', 'nama', 'peminat', 'jenjang']].astype({'asal_univ': str, 'nama': str, 'jenjang': str})
+
+
+def sunburst(df, provinsi="bali"):
+    return (df.loc[df['provinsi'].str.lower() == provinsi, ['asal_univ', 'jenjang', 'nama', 'peminat']]
+            .astype({'asal_univ': str, 'jenjang': str, 'nama': str}))
+
+
+# Bagian yang hanya bergantung pada versi data, bukan pada filter
+FULL_DATA_INPUTS = {
+    "rasio_tertinggi": rasio_tertinggi,
+    "bubble": bubble,
+    "treemap": treemap,
+    "sunburst": sunburst,
+}
@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from data_loader import DATA_PATH, read_csv
+from ingest import KEY_COLUMNS, Store, read_batch
+
+PROVINCES = ["Bali", "Sulawesi Tenggara"]
+
+
+@pytest.fixture
+def source():
+    df = read_csv(DATA_PATH)
+    return df[df["provinsi"].isin(PROVINCES)].reset_index(drop=True)
+
+
+def write_csv(df, path):
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def rows_for(loaded, keys):
+    return loaded.astype({col: str for col in KEY_COLUMNS}).merge(keys, on=KEY_COLUMNS)
+
+
+def assert_consistent(store, tahun):
+    loaded = store.load(tahun)
+    # Agregat inkremental harus sama dengan menghitung ulang dari partisi
+    peminat = loaded.groupby("provinsi", observed=True)["peminat"].sum()
+    pd.testing.assert_series_equal(store.province_peminat(tahun).sort_index(),
+                                   peminat.rename_axis("provinsi").astype("int64").rename("peminat"),
+                                   check_index_type=False, check_categorical=False)
+    rasio = loaded.groupby("asal_univ", observed=True)["rasio_keketatan"].mean()
+    expected = store.university_rasio_mean(tahun).sort_index()
+    pd.testing.assert_series_equal(expected, rasio.sort_index().rename("rasio_keketatan"),
+                                   check_index_type=False, check_categorical=False)
+    assert sum(p["rows"] for p in store.manifest["partitions"].values()) == len(loaded)
+    pd.testing.assert_series_equal(loaded["rasio_keketatan"], loaded["daya_tampung"] / loaded["peminat"],
+                                   check_names=False)
+    assert (loaded["sepi_peminatan"] == (loaded["rasio_keketatan"] <= loaded["rata-rata_rasio"])).all()
+    return loaded
+
+
+def test_insert_update_aggregate(tmp_path, source):
+    store = Store(str(tmp_path / "store"))
+    summary = store.ingest(read_batch(write_csv(source, tmp_path / "awal.csv"), duplicates="sum"))
+    assert summary["updated"] == 0
+    assert summary["inserted"] == len(source.drop_duplicates(KEY_COLUMNS))
+    before = assert_consistent(store, 2025)
+
+    # Update di tengah siklus: hanya kolom peminat, tanpa provinsi
+    update = source.drop_duplicates(KEY_COLUMNS).head(5)[KEY_COLUMNS].assign(peminat=1000)
+    summary = store.ingest(read_batch(write_csv(update, tmp_path / "update.csv"), tahun=2025))
+    assert (summary["inserted"], summary["updated"]) == (0, 5)
+    assert store.version == "store-v2"
+    after = assert_consistent(store, 2025)
+
+    assert len(after) == len(before)
+    keys = update[KEY_COLUMNS]
+    assert (rows_for(after, keys)["peminat"] == 1000).all()
+    replaced = rows_for(before, keys)["peminat"].sum()
+    assert after["peminat"].sum() == before["peminat"].sum() - replaced + 1000 * len(keys)
+
+
+def test_duplicate_keys(tmp_path, source):
+    path = write_csv(source, tmp_path / "batch.csv")
+    with pytest.raises(ValueError, match="Oseanografi"):
+        read_batch(path)
+    last = read_batch(path, duplicates="last")
+    summed = read_batch(path, duplicates="sum")
+    assert len(last) == len(summed) == len(source) - 1
+    assert summed["peminat"].sum() == source["peminat"].sum()
+    assert summed["daya_tampung"].sum() == source["daya_tampung_2025"].sum()
+    assert last["peminat"].sum() < source["peminat"].sum()